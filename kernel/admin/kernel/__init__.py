@@ -6,16 +6,96 @@ from django.core.urlresolvers import reverse, reverse_lazy
 from django.http import Http404, HttpResponseRedirect
 from django.utils.encoding import force_text
 from django.utils.html import escape
-from django.core.exceptions import PermissionDenied
+from django.core.exceptions import PermissionDenied, FieldDoesNotExist
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator, EmptyPage
+from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
 # Import kernel module
 from kernel import forms as kforms
 from kernel import models as km
 from kernel.admin import action as kaa
 from kernel.utils import login_as
+from kernel.pagination import count_queryset
 
 
-class BaseAdmin(admin.ModelAdmin):
+class EstimatedCountPaginator(Paginator):
+    """
+    Planner estimate instead of COUNT(*) on huge tables; a page past the estimate
+    is checked against the exact count, so trailing pages stay reachable
+    """
+    exact = False
+
+    @cached_property
+    def count(self):
+        return count_queryset(self.object_list, 'estimate')
+
+    def validate_number(self, number):
+        try:
+            return super(EstimatedCountPaginator, self).validate_number(number)
+        except EmptyPage:
+            if self.exact:
+                raise
+        self.exact = True
+        self.__dict__['count'] = self.object_list.count()
+        self.__dict__.pop('num_pages', None)
+        return super(EstimatedCountPaginator, self).validate_number(number)
+
+
+class KernelChangeList(ChangeList):
+    """ Changelist rows with the prefetches of KernelAdminQueryMixin.get_related_lookups """
+
+    def get_queryset(self, request):
+        queryset = super(KernelChangeList, self).get_queryset(request)
+        select, prefetch = self.model_admin.get_related_lookups(request)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
+
+
+class KernelAdminQueryMixin(object):
+    """
+    Changelist query plan derived from list_display: foreign keys are joined,
+    many-to-many fields and `list_prefetch_related` are prefetched (changelist only,
+    change views and other admin querysets are left alone).
+    """
+    list_prefetch_related = ()
+    estimate_count = False
+
+    def __init__(self, *args, **kwargs):
+        super(KernelAdminQueryMixin, self).__init__(*args, **kwargs)
+        if self.estimate_count:
+            self.show_full_result_count = False
+
+    def get_related_lookups(self, request):
+        select, prefetch = [], list(self.list_prefetch_related)
+        for name in self.get_list_display(request):
+            if not isinstance(name, str):
+                continue
+            try:
+                field = self.model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.many_to_many or field.one_to_many:
+                prefetch.append(name)
+            elif field.many_to_one or (field.one_to_one and field.concrete):
+                select.append(name)
+        return select, prefetch
+
+    def get_list_select_related(self, request):
+        select, prefetch = self.get_related_lookups(request)
+        return select or self.list_select_related
+
+    def get_changelist(self, request, **kwargs):
+        return KernelChangeList
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        if self.estimate_count:
+            return EstimatedCountPaginator(queryset, per_page, orphans, allow_empty_first_page)
+        return super(KernelAdminQueryMixin, self).get_paginator(request, queryset, per_page, orphans, allow_empty_first_page)
+
+
+class BaseAdmin(KernelAdminQueryMixin, admin.ModelAdmin):
     list_per_page = 100
 
     def get_fieldsets(self, request, obj=None):
@@ -42,11 +122,12 @@ class BaseAdmin(admin.ModelAdmin):
         obj.save()
 
 
-class KernelUserAdmin(UserAdmin):
+class KernelUserAdmin(KernelAdminQueryMixin, UserAdmin):
     """
     Базовый класс для User моделей
     """
     actions = [kaa.move_to_group]
+    list_prefetch_related = ('groups', )
     list_per_page = 100
     ordering = ('-id',)
     list_display = km.KernelUser.list_display() + ('groups_list', 'login_as')
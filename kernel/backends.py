@@ -1,9 +1,37 @@
+from django.apps import apps
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db.models.fields.files import FieldFile
 
 from kernel.middleware import CrequestMiddleware
+from kernel import cache as kcache
+from kernel import permissions as kperm
+
+import threading
+
+
+def user_cache_tag(pk):
+    return 'kernel.user:{}'.format(pk)
+
+
+def user_cache_tags(pk):
+    return [user_cache_tag(pk), kperm.PERMISSIONS_TAG, kperm.user_permissions_tag(pk)]
 
 
 class KernelAuthBackend(object):
+    """
+    With KERNEL_USER_CACHE = True the authenticated user is loaded from a cached snapshot
+    (fields without password / last_login, session auth hash, groups and permissions), invalidated
+    on user save, on queryset update() of users and on group / permission changes. Needs a cache
+    shared by every worker (memcached, redis): a per-process cache never sees invalidations of
+    other workers. Off by default, the user is loaded from the database.
+    """
+    excluded_fields = ('password', 'last_login')
+    _lock = threading.Lock()
+    hits = 0
+    misses = 0
 
     def authenticate(self, username=None, password=None, **kwargs):
         UserModel = get_user_model()
@@ -15,8 +43,83 @@ class KernelAuthBackend(object):
         except get_user_model().DoesNotExist:
             return None
 
+    def user_can_authenticate(self, user):
+        """ Inactive users are rejected as by ModelBackend, is_active of a snapshot is as fresh as its tags """
+        is_active = getattr(user, 'is_active', None)
+        return is_active or is_active is None
+
     def get_user(self, user_id):
+        if not getattr(settings, 'KERNEL_USER_CACHE', False):
+            user = self.load_user(user_id)
+            return user if user is not None and self.user_can_authenticate(user) else None
+
+        key = kcache.make_key('user:{}'.format(user_id), user_cache_tags(user_id))
+        snapshot = cache.get(key)
+        if snapshot is not None:
+            self._count('hits')
+            user = self.from_snapshot(snapshot)
+        else:
+            self._count('misses')
+            user = self.load_user(user_id)
+            if user is not None:
+                cache.set(key, self.to_snapshot(user), getattr(settings, 'KERNEL_USER_CACHE_TIMEOUT', 3600))
+        return user if user is not None and self.user_can_authenticate(user) else None
+
+    @classmethod
+    def _count(cls, name):
+        with cls._lock:
+            setattr(cls, name, getattr(cls, name) + 1)
+
+    @classmethod
+    def stats(cls):
+        """ Snapshot hits and misses of this process """
+        return {'hits': cls.hits, 'misses': cls.misses}
+
+    def load_user(self, user_id):
         try:
-            return get_user_model().objects.get(pk=user_id)
+            user = get_user_model().objects.prefetch_related('groups').get(pk=user_id)
         except get_user_model().DoesNotExist:
-            return None
\ No newline at end of file
+            return None
+        backend = ModelBackend()
+        backend.get_all_permissions(user)
+        return user
+
+    @classmethod
+    def to_snapshot(cls, user):
+        fields = []
+        for field in user._meta.concrete_fields:
+            if field.attname in cls.excluded_fields:
+                continue
+            value = getattr(user, field.attname)
+            fields.append((field.attname, value.name if isinstance(value, FieldFile) else value))
+        return {
+            'model': user._meta.label_lower,
+            'db': user._state.db,
+            'fields': fields,
+            'session_auth_hash': user.get_session_auth_hash() if hasattr(user, 'get_session_auth_hash') else None,
+            'groups': [(group.pk, group.name) for group in user.groups.all()],
+            'user_perms': getattr(user, '_user_perm_cache', None),
+            'group_perms': getattr(user, '_group_perm_cache', None),
+            'perms': getattr(user, '_perm_cache', None),
+        }
+
+    @staticmethod
+    def from_snapshot(snapshot):
+        from django.contrib.auth.models import Group
+
+        model = apps.get_model(snapshot['model'])
+        names, values = zip(*snapshot['fields'])
+        user = model.from_db(snapshot['db'], list(names), list(values))
+        if snapshot['session_auth_hash'] is not None:
+            session_auth_hash = snapshot['session_auth_hash']
+            user.get_session_auth_hash = lambda: session_auth_hash
+
+        groups = Group.objects.filter(pk__in=[pk for pk, name in snapshot['groups']])
+        groups._result_cache = [Group.from_db(snapshot['db'], ['id', 'name'], list(group)) for group in snapshot['groups']]
+        groups._prefetch_done = True
+        user._prefetched_objects_cache = {'groups': groups}
+
+        for attr in ('user_perms', 'group_perms', 'perms'):
+            if snapshot[attr] is not None:
+                setattr(user, '_{}_cache'.format(attr.replace('perms', 'perm')), snapshot[attr])
+        return user
@@ -0,0 +1,47 @@
+from django.core.cache import cache
+
+import hashlib
+
+
+__all__ = [
+    'get_versions', 'bump_tags', 'make_key', 'get_or_set',
+]
+
+
+VERSION_PREFIX = 'kernel:tag:'
+
+
+def get_versions(tags):
+    """ Current version of every tag, missing tags start at 1 """
+    keys = [VERSION_PREFIX + tag for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, 1, None)
+            versions[key] = cache.get(key, 1)
+    return [versions[key] for key in keys]
+
+
+def bump_tags(*tags):
+    """ Invalidate everything cached under any of the tags """
+    for tag in tags:
+        key = VERSION_PREFIX + tag
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 2, None)
+
+
+def make_key(key, tags):
+    versions = '.'.join(str(v) for v in get_versions(tags))
+    return 'kernel:{}:{}'.format(key, hashlib.md5(versions.encode('utf-8')).hexdigest())
+
+
+def get_or_set(key, tags, builder, timeout=None):
+    """ Cache result of builder() under key, valid until one of the tags is bumped """
+    key = make_key(key, tags)
+    value = cache.get(key)
+    if value is None:
+        value = builder()
+        cache.set(key, value, timeout)
+    return value
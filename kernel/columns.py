@@ -0,0 +1,133 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models
+
+from urllib import parse
+
+import ast
+import json
+
+
+__all__ = [
+    'table_columns', 'encode_hidden', 'decode_hidden', 'get_user_hidden', 'set_user_hidden',
+    'deferrable_fields', 'ColumnPreferenceMixin',
+]
+
+
+MASK_PREFIX = 'm'
+LEGACY_MAX_LENGTH = 4096
+
+
+def table_columns(table_class):
+    """ Column names of a django_tables2 table in declaration order, the bit order of the mask """
+    return tuple(table_class.base_columns)
+
+
+def encode_hidden(columns, hidden):
+    """ Hidden column names as "m<hex bitmask>", bit i is columns[i] """
+    mask = 0
+    for i, name in enumerate(columns):
+        if name in hidden:
+            mask |= 1 << i
+    return '{}{:x}'.format(MASK_PREFIX, mask)
+
+
+def _decode_legacy(value):
+    """ Old cookies: a list literal of names, parsed as JSON or as a literal, never evaluated """
+    if len(value) > LEGACY_MAX_LENGTH:
+        return []
+    try:
+        names = json.loads(value)
+    except ValueError:
+        try:
+            names = ast.literal_eval(value)
+        except (ValueError, SyntaxError, MemoryError, RecursionError):
+            return []
+    if not isinstance(names, (list, tuple)):
+        return []
+    return [name for name in names if isinstance(name, str)]
+
+
+def decode_hidden(columns, value):
+    """ Hidden column names from a cookie value: bitmask or legacy list, unknown names are dropped """
+    value = parse.unquote(value or '').strip()
+    if not value:
+        return []
+    if value.startswith(MASK_PREFIX):
+        try:
+            mask = int(value[len(MASK_PREFIX):], 16)
+        except ValueError:
+            return []
+        return [name for i, name in enumerate(columns) if mask >> i & 1]
+    names = set(_decode_legacy(value))
+    return [name for name in columns if name in names]
+
+
+def _user_key(user, key):
+    return 'kernel:columns:{}:{}'.format(user.pk, key)
+
+
+def get_user_hidden(user, key):
+    """ Mask stored for the user (KERNEL_COLUMN_PREFERENCES), None if there is none """
+    if not getattr(settings, 'KERNEL_COLUMN_PREFERENCES', True) or not getattr(user, 'pk', None):
+        return None
+    return cache.get(_user_key(user, key))
+
+
+def set_user_hidden(user, key, value):
+    if getattr(settings, 'KERNEL_COLUMN_PREFERENCES', True) and getattr(user, 'pk', None):
+        cache.set(_user_key(user, key), value, getattr(settings, 'KERNEL_COLUMN_PREFERENCES_TIMEOUT', None))
+
+
+def deferrable_fields(table_class, model, hidden):
+    """
+    Concrete non-relational model fields read only by hidden columns,
+    safe for queryset.defer() (no select_related conflict, never the pk)
+    """
+    concrete = {f.name for f in model._meta.concrete_fields
+                if not f.is_relation and not f.primary_key}
+    visible, candidates = set(), set()
+    for name, column in table_class.base_columns.items():
+        accessor = str(getattr(column, 'accessor', None) or name).replace('__', '.').split('.')[0]
+        (candidates if name in hidden else visible).add(accessor)
+    return sorted((candidates - visible) & concrete)
+
+
+class ColumnPreferenceMixin(object):
+    """
+    KernelList columns hidden by the user: read from the per path cookie (bitmask "m<hex>"
+    or an old list literal) or from the user preference cache. Hidden columns are excluded
+    from the table and their fields deferred in the queryset.
+    """
+
+    def get_columns_key(self):
+        return str(self.request.path).replace('/', '')
+
+    def get_hidden_columns(self):
+        if not hasattr(self, '_hidden_columns'):
+            table_class = self.get_table_class()
+            columns = table_columns(table_class)
+            key = self.get_columns_key()
+            stored = get_user_hidden(self.request.user, key)
+            cookie = self.request.COOKIES.get(key)
+            hidden = decode_hidden(columns, stored if cookie is None else cookie)
+            if cookie is not None and encode_hidden(columns, hidden) != stored:
+                set_user_hidden(self.request.user, key, encode_hidden(columns, hidden))
+            self._hidden_columns = hidden
+        return self._hidden_columns
+
+    def get_queryset(self):
+        queryset = super(ColumnPreferenceMixin, self).get_queryset()
+        hidden = self.get_hidden_columns()
+        if hidden and isinstance(queryset, models.QuerySet):
+            fields = deferrable_fields(self.get_table_class(), queryset.model, hidden)
+            if fields:
+                queryset = queryset.defer(*fields)
+        return queryset
+
+    def get_table_kwargs(self):
+        kwargs = super(ColumnPreferenceMixin, self).get_table_kwargs()
+        hidden = self.get_hidden_columns()
+        if hidden:
+            kwargs['exclude'] = tuple(kwargs.get('exclude') or ()) + tuple(hidden)
+        return kwargs
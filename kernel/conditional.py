@@ -0,0 +1,125 @@
+from django.db import transaction
+from django.db.models import Max, Count
+from django.db.models.signals import class_prepared, post_delete
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from kernel import cache as kcache
+
+import calendar
+import hashlib
+
+
+__all__ = [
+    'object_validators', 'queryset_validators', 'conditional_response', 'set_validators',
+    'deleted_tag', 'ConditionalDetailMixin', 'ConditionalListMixin',
+]
+
+
+def _etag(request, *parts):
+    """ Weak ETag of the parts, the user and the negotiated format (DRF renderer) of the request """
+    renderer = getattr(request, 'accepted_renderer', None)
+    parts += (getattr(request.user, 'pk', None), getattr(renderer, 'format', ''))
+    return 'W/' + quote_etag(hashlib.md5(':'.join(str(p) for p in parts).encode('utf-8')).hexdigest())
+
+
+def deleted_tag(model):
+    """ Cache tag bumped after every delete of a CONDITIONAL_GET model """
+    return '{}:deleted'.format(model._meta.label_lower)
+
+
+def _deleted(sender, using, **kwargs):
+    transaction.on_commit(lambda: kcache.bump_tags(deleted_tag(sender)), using=using)
+
+
+def _class_prepared(sender, **kwargs):
+    # Only CONDITIONAL_GET models get the receiver, others keep fast (signal-less) deletes
+    if getattr(sender, 'CONDITIONAL_GET', False):
+        post_delete.connect(_deleted, sender=sender, dispatch_uid='kernel_conditional_deleted')
+
+
+class_prepared.connect(_class_prepared, dispatch_uid='kernel_conditional_prepared')
+
+
+def _timestamp(value):
+    return calendar.timegm(value.utctimetuple()) if value else None
+
+
+def object_validators(obj, request, *extra):
+    """
+    (ETag, Last-Modified timestamp) of one object, ETag varies by user,
+    `extra` parts change the ETag too (related objects rendered with it)
+    """
+    last_modified = getattr(obj, 'modified_date', None)
+    etag = _etag(request, obj._meta.label_lower, obj.pk, last_modified.isoformat() if last_modified else '', *extra)
+    return etag, _timestamp(last_modified) if not extra else None
+
+
+def queryset_validators(queryset, request, *extra, count=True):
+    """
+    (ETag, None) of a filtered list: MAX(modified_date) and, with `count`, COUNT, by path and user,
+    `extra` parts change the ETag too (hidden columns). Lists send no Last-Modified,
+    If-Modified-Since can not see deleted rows. Without `count` deletions are seen through
+    the deleted_tag() version, bumped for models with CONDITIONAL_GET.
+    """
+    model = queryset.model
+    aggregates = {'last_modified': Max('modified_date')}
+    if count:
+        aggregates['count'] = Count('pk')
+    data = queryset.order_by().aggregate(**aggregates)
+    last_modified = data['last_modified']
+    deleted = '' if count else kcache.get_versions([deleted_tag(model)])[0]
+    etag = _etag(request, model._meta.label_lower, request.get_full_path(), data.get('count', ''), deleted,
+                 last_modified.isoformat() if last_modified else '', *extra)
+    return etag, None
+
+
+def conditional_response(request, etag, last_modified):
+    """ 304 response if the client copy is fresh, otherwise None """
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None:
+        patch_vary_headers(response, ('Accept', ))
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    """ ETag / Last-Modified of a 200 response, the ETag depends on the format: Vary: Accept """
+    if response.status_code == 200:
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ('Accept', ))
+    return response
+
+
+class ConditionalDetailMixin(object):
+    """
+    DetailView answering If-None-Match / If-Modified-Since before rendering,
+    get_conditional_parts() adds what else the template renders (e.g. related modified dates)
+    """
+
+    def get_conditional_parts(self, obj):
+        return ()
+
+    def get(self, request, *args, **kwargs):
+        self.object = self.get_object()
+        etag, last_modified = object_validators(self.object, request, *self.get_conditional_parts(self.object))
+        response = conditional_response(request, etag, last_modified)
+        if response is not None:
+            return response
+        response = self.render_to_response(self.get_context_data(object=self.object))
+        return set_validators(response, etag, last_modified)
+
+
+class ConditionalListMixin(object):
+    """ KernelList answering If-None-Match before filtering into the table, no COUNT with keyset pagination """
+
+    def get(self, request, *args, **kwargs):
+        queryset = self.get_filterset_class()(self.get_filterset_data(), queryset=self.get_queryset()).qs
+        hidden = self.get_hidden_columns() if hasattr(self, 'get_hidden_columns') else ()
+        etag, last_modified = queryset_validators(queryset, request, ','.join(hidden),
+                                                  count=not getattr(self, 'keyset_ordering', None))
+        response = conditional_response(request, etag, last_modified)
+        if response is not None:
+            return response
+        return set_validators(super(ConditionalListMixin, self).get(request, *args, **kwargs), etag, last_modified)
@@ -1,5 +1,5 @@
 from .permalink import KernelPermalinkModel
 from .action import ActionKernelModel
 from .views import KernelViewsModel
-from .serializer import KernelSerializerModel
+from .serializer import KernelSerializerModel, NonPolymorphicSerializerMixin
 from .uri import KernelUriModel
@@ -1,8 +1,9 @@
-from typing import Type
+from typing import TypeVar
 from kernel.middleware import CrequestMiddleware
+from kernel import permissions as kperm
 
 
-_cls = Type('KernelModel', bound='kernel.models.base.KernelModel')
+_cls = TypeVar('KernelModel', bound='kernel.models.base.KernelModel')
 
 
 class ActionKernelModel(object):
@@ -13,39 +14,53 @@ class ActionKernelModel(object):
 
     @classmethod
     def generate_perm(cls: _cls, action):
-        app_label = cls._meta.app_label
-        class_name = cls._meta.model_name
-        return '{}.{}_{}'.format(app_label, action, class_name)
+        perms = cls.__dict__.get('_kernel_perms')
+        if perms is None:
+            perms = {}
+            setattr(cls, '_kernel_perms', perms)
+        perm = perms.get(action)
+        if perm is None:
+            perm = perms[action] = '{}.{}_{}'.format(cls._meta.app_label, action, cls._meta.model_name)
+        return perm
+
+    @classmethod
+    def has_action_perm(cls, user, action):
+        return kperm.has_perm(user, cls.generate_perm(action))
+
+    @classmethod
+    def can_objects_action(cls, user, action, objects):
+        """ {obj.pk: bool} of the action permission for a list of objects """
+        return kperm.has_perm_bulk(user, cls.generate_perm(action), objects)
 
     @classmethod
     def can_action_create(cls, request):
-        return request.user.has_perm(cls.generate_perm('add'))
+        return cls.has_action_perm(request.user, 'add')
 
     @classmethod
     def can_action_update(cls, request):
-        return request.user.has_perm(cls.generate_perm('change'))
+        return cls.has_action_perm(request.user, 'change')
 
     @classmethod
     def can_action_delete(cls, request):
-        return request.user.has_perm(cls.generate_perm('delete'))
+        return cls.has_action_perm(request.user, 'delete')
 
     @classmethod
     def can_action_view_detail(cls, request):
-        return request.user.has_perm(cls.generate_perm('view'))
+        return cls.has_action_perm(request.user, 'view')
 
     @classmethod
     def can_action_view_list(cls, request):
-        return request.user.has_perm(cls.generate_perm('view'))
+        return cls.has_action_perm(request.user, 'view')
 
     @classmethod
     def can_action_export(cls, request):
-        return request.user.has_perm(cls.generate_perm('view'))
+        return cls.has_action_perm(request.user, 'view')
 
     def can_object_action_create(self):
-        return self.action_user.has_perm(self.generate_perm('create'))
+        return self.has_action_perm(self.action_user, 'create')
 
     def can_object_action_update(self):
-        return self.action_user.has_perm(self.generate_perm('change'))
+        return self.has_action_perm(self.action_user, 'change')
 
     def can_object_action_delete(self):
-        return self.action_user.has_perm(self.generate_perm('delete'))
+        return self.has_action_perm(self.action_user, 'delete')
@@ -1,3 +1,30 @@
+from kernel.registry import cached_class
+
+
+
+class NonPolymorphicSerializerMixin(object):
+    """
+    ModelSerializer mixin: related fields to polymorphic models (created_by, users) look rows up
+    as the base class, without content type resolution and child table queries.
+    Rendered instances come from the viewset queryset, see BaseViewSets.non_polymorphic.
+    """
+
+    def build_relational_field(self, field_name, relation_info):
+        field_class, field_kwargs = super(NonPolymorphicSerializerMixin, self).build_relational_field(
+            field_name, relation_info)
+        queryset = field_kwargs.get('queryset')
+        if queryset is not None and hasattr(queryset, 'non_polymorphic'):
+            field_kwargs['queryset'] = queryset.non_polymorphic()
+        return field_class, field_kwargs
+
+
+def model_serializer_base(non_polymorphic=False):
+    """ Base class of factory serializers: ModelSerializer, which skips downcasting with non_polymorphic """
+    from rest_framework import serializers
+    if non_polymorphic:
+        return type('NonPolymorphicModelSerializer', (NonPolymorphicSerializerMixin, serializers.ModelSerializer), {})
+    return serializers.ModelSerializer
+
 
 class KernelSerializerModel(object):
 
@@ -6,16 +33,18 @@ class KernelSerializerModel(object):
         return [f.name for f in cls._meta.get_fields() if not f.related_model]
 
     @classmethod
-    def serializer_class(cls):
+    @cached_class
+    def serializer_class(cls, non_polymorphic=False):
         """
         class Serializer(serializers.ModelSerializer):
             class Meta:
                 model = cls
                 fields = cls.serializer_data()
         return Serializer
-        """
 
-        class Serializer(serializers.ModelSerializer):
+        non_polymorphic: related fields of serializer_data() skip downcasting
+        """
+        class Serializer(model_serializer_base(non_polymorphic)):
             class Meta:
                 model = cls
                 fields = cls.serializer_data()
@@ -1,11 +1,31 @@
 from django.conf.urls import url
 
+from kernel.registry import cached_class
+
+
+__all__ = [
+    'KernelUriModel', 'lazy_view',
+]
+
+
+def lazy_view(label, kind):
+    """
+    View of a model route kind ('app_label.Model', 'list') built on the first request,
+    used by the static urls module emitted with `manage.py kernel_urls --output`
+    """
+    def view(request, *args, **kwargs):
+        from django.apps import apps
+        return apps.get_model(label).get_route_view(kind)(request, *args, **kwargs)
+    view.__name__ = '{}_{}'.format(label.replace('.', '_').lower(), kind)
+    return view
+
 
 class KernelUriModel(object):
 
     URI = 'pk'
     URI_FORMAT_DETAIL = None
     ALIAS = False
+    ROUTES = ('create', 'update', 'delete', 'detail', 'list', 'export', 'detail_export')
 
     @classmethod
     def get_alias(cls):
@@ -13,51 +33,75 @@ class KernelUriModel(object):
             return cls.ALIAS
         return str(cls.__name__).lower()
 
+    @classmethod
+    def route_kinds(cls):
+        """
+        ROUTES, then kinds of get_uri_<kind> methods added by subclasses
+        (routes of the kernel itself are published only when listed in ROUTES)
+        """
+        extra = sorted(name[len('get_uri_'):] for name in dir(cls) if name.startswith('get_uri_')
+                       and not hasattr(KernelUriModel, name) and callable(getattr(cls, name)))
+        return tuple(cls.ROUTES) + tuple(kind for kind in extra if kind not in cls.ROUTES)
+
+    @classmethod
+    @cached_class
+    def get_route_view(cls, kind):
+        """ as_view() of a route kind, created once per model, the callback of get_uri_<kind> for custom routes """
+        if kind == 'detail':
+            return cls.get_detail_view_class(cls.URI).as_view()
+        view_class = getattr(cls, 'get_{}_view_class'.format(kind), None)
+        if view_class is None:
+            return getattr(cls, 'get_uri_{}'.format(kind))().callback
+        return view_class().as_view()
+
     @classmethod
     def get_uri_create(cls):
-        from django.conf.urls import url
-        fields = cls.list_fields()
         return url(r'^%s/new.html$' % cls.get_alias(),
-                   cls.get_create_view_class().as_view(), name='{0}_create'.format(str(cls.__name__).lower()))
+                   cls.get_route_view('create'), name='{0}_create'.format(str(cls.__name__).lower()))
 
     @classmethod
     def get_uri_update(cls):
         return url(r'^%s/(?P<pk>\d+)/edit/$' % cls.get_alias(),
-                   cls.get_update_view_class().as_view(), name='{0}_update'.format(str(cls.__name__).lower()))
+                   cls.get_route_view('update'), name='{0}_update'.format(str(cls.__name__).lower()))
 
     @classmethod
     def get_uri_delete(cls):
         return url(r'^%s/(?P<pk>\d+)/delete/' % cls.get_alias(),
-                   cls.get_delete_view_class().as_view(), name='{0}_delete'.format(str(cls.__name__).lower()))
+                   cls.get_route_view('delete'), name='{0}_delete'.format(str(cls.__name__).lower()))
 
     @classmethod
     def get_uri_detail(cls, pk: str = URI, format: str = '.html'):
         return url(r'^%s/(?P<%s>[a-zA-Z0-9_A-Яа-я-]{1,300})%s$' %
                    (cls.get_alias(), cls.URI, (cls.URI_FORMAT_DETAIL if cls.URI_FORMAT_DETAIL else format)),
-                   cls.get_detail_view_class(cls.URI).as_view(),
+                   cls.get_route_view('detail'),
                    name='{0}_view'.format(str(cls.__name__).lower()))
 
     @classmethod
     def get_uri_list(cls):
         return url(r'^%s/$' % cls.get_alias().lower(),
-                   cls.get_list_view_class().as_view(), name='{0}_list'.format(str(cls.__name__).lower()))
+                   cls.get_route_view('list'), name='{0}_list'.format(str(cls.__name__).lower()))
 
     @classmethod
     def get_uri_export(cls):
         return url(r'^%s/export/' % cls.get_alias(),
-                   cls.get_export_view_class().as_view(), name='{0}_export'.format(str(cls.__name__).lower()))
+                   cls.get_route_view('export'), name='{0}_export'.format(str(cls.__name__).lower()))
 
     @classmethod
     def get_uri_detail_export(cls):
         return url(r'^%s/(?P<pk>\d+)/export/' % cls.get_alias(),
-                   cls.get_detail_export_view_class().as_view(),
+                   cls.get_route_view('detail_export'),
                    name='{0}_detail_export'.format(str(cls.__name__).lower()))
 
+    @classmethod
+    @cached_class
+    def url_patterns(cls):
+        """ Patterns of route_kinds(), built once per model """
+        return tuple(getattr(cls, 'get_uri_{}'.format(kind))() for kind in cls.route_kinds())
+
+    @classmethod
+    def urls(cls):
+        return list(cls.url_patterns())
+
     @classmethod
     def get_uri_crud(cls):
-        import re
-        uri_list = []
-        for m in cls.methods():
-            if re.match('get_uri_', m) and not m == 'get_uri_crud':
-                uri_list.append(getattr(cls, m)())
-        return uri_list
\ No newline at end of file
+        return cls.urls()
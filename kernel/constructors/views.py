@@ -7,6 +7,9 @@ from django.views.generic.edit import CreateView, UpdateView, DeleteView
 from django.views.generic import TemplateView, ListView
 from django.http.response import HttpResponse
 from kernel.views.kernel import KernelViewSetMixin, KernelDispachMixin
+from kernel.export import streaming_export_response
+from kernel.registry import cached_class
+from kernel.utils import slugify
 
 import csv
 
@@ -24,6 +27,7 @@ class KernelViewsModel(object):
         return KernelViewSetMixin.update_class_form(cls)
 
     @classmethod
+    @cached_class
     def get_delete_view_class(cls):
 
         class Delete(KernelDispachMixin, DeleteView):
@@ -40,6 +44,7 @@ class KernelViewsModel(object):
         return Delete
 
     @classmethod
+    @cached_class
     def get_detail_export_view_class(cls):
 
         class ClassView(KernelDispachMixin, DetailView):
@@ -49,6 +54,7 @@ class KernelViewsModel(object):
         return ClassView
 
     @classmethod
+    @cached_class
     def get_detail_view_class(cls, uri_: str = 'slug'):
 
         class ClassView(KernelDispachMixin, DetailView):
@@ -60,6 +66,7 @@ class KernelViewsModel(object):
         return ClassView
 
     @classmethod
+    @cached_class
     def get_list_view_class(cls):
 
         class ClassView(KernelDispachMixin, ListView):
@@ -70,6 +77,7 @@ class KernelViewsModel(object):
         return ClassView
 
     @classmethod
+    @cached_class
     def get_export_view_class(cls):
 
         class ClassView(ListView):
@@ -82,9 +90,17 @@ class KernelViewsModel(object):
                     raise PermissionDenied
 
                 queryset_list = cls.filter_class()(self.request.GET, queryset=self.get_queryset())
-                export = self.model.get_export_class()().export(queryset_list)
-
                 export_type = self.request.GET.get('export', 'csv')
+
+                filename = slugify(cls.get_alias())
+                if cls._meta.verbose_name:
+                    filename = slugify(cls._meta.verbose_name)
+
+                if cls.EXPORT_STREAM:
+                    return streaming_export_response(self.model.get_export_class()(), queryset_list.qs,
+                                                     export_type, filename, cls.EXPORT_CHUNK_SIZE)
+
+                export = self.model.get_export_class()().export(queryset_list)
                 if 'csv' in export_type:
                     response = HttpResponse(content_type='text/csv')
                 elif 'xlsx' in export_type:
@@ -92,9 +108,6 @@ class KernelViewsModel(object):
                 else:
                     response = HttpResponse(content_type='text/csv')
 
-                filename = slugify(cls.get_alias())
-                if cls._meta.verbose_name:
-                    filename = slugify(cls._meta.verbose_name)
                 response['Content-Disposition'] = 'attachment; filename="%s.%s"' % (filename, export_type)
                 response.write(export.__getattribute__(export_type))
                 return response
@@ -0,0 +1,84 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction, DatabaseError
+from django.db.models import Case, When, Value, F, IntegerField
+
+import atexit
+import logging
+import threading
+import time
+
+
+__all__ = [
+    'ViewCounter', 'view_counter',
+]
+
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter(object):
+    """
+    In-process buffer of counter increments, flushed with
+        UPDATE ... SET views = views + CASE id WHEN ... END WHERE id IN (...)
+    Queryset update does not call save(), so modified_date and caches are not touched.
+    The flush runs after the current transaction commits, so a rolled back request
+    (ATOMIC_REQUESTS) keeps the buffer for the next flush.
+    """
+
+    def __init__(self, field='views', interval=None, threshold=None, batch_size=500):
+        self.field = field
+        self.interval = interval
+        self.threshold = threshold
+        self.batch_size = batch_size
+        self._deltas = defaultdict(lambda: defaultdict(int))
+        self._hits = 0
+        self._flushed = time.time()
+        self._lock = threading.Lock()
+
+    def get_interval(self):
+        return self.interval if self.interval is not None else getattr(settings, 'KERNEL_VIEWS_FLUSH_INTERVAL', 60)
+
+    def get_threshold(self):
+        return self.threshold if self.threshold is not None else getattr(settings, 'KERNEL_VIEWS_FLUSH_THRESHOLD', 1000)
+
+    def incr(self, obj, count=1):
+        with self._lock:
+            self._deltas[type(obj)][obj.pk] += count
+            self._hits += count
+            flush = self._hits >= self.get_threshold() or time.time() - self._flushed >= self.get_interval()
+            if flush:
+                self._hits = 0
+                self._flushed = time.time()
+        if flush:
+            transaction.on_commit(self.flush)
+
+    def pending(self, obj):
+        """ Buffered increments of obj, not yet written """
+        return self._deltas.get(type(obj), {}).get(obj.pk, 0)
+
+    def flush(self):
+        with self._lock:
+            deltas, self._deltas = self._deltas, defaultdict(lambda: defaultdict(int))
+            self._hits = 0
+            self._flushed = time.time()
+        for model, counts in deltas.items():
+            items = list(counts.items())
+            for i in range(0, len(items), self.batch_size):
+                batch = items[i:i + self.batch_size]
+                increment = Case(*[When(pk=pk, then=Value(n)) for pk, n in batch],
+                                 default=Value(0), output_field=IntegerField())
+                try:
+                    with transaction.atomic():
+                        model._base_manager.filter(pk__in=[pk for pk, n in batch]).update(
+                            **{self.field: F(self.field) + increment})
+                except DatabaseError:
+                    logger.exception('Views of %s were not flushed', model.__name__)
+                    with self._lock:
+                        for pk, n in batch:
+                            self._deltas[model][pk] += n
+
+
+view_counter = ViewCounter()
+atexit.register(view_counter.flush)
@@ -0,0 +1,46 @@
+from django.db import connections
+from django.db.models import Case, Value, When
+
+try:
+    from django.db.models.functions import Cast
+except ImportError:  # Django < 1.10
+    Cast = None
+
+
+__all__ = [
+    'bulk_update',
+]
+
+
+def bulk_update(queryset, objs, fields, batch_size=None):
+    """
+    QuerySet.bulk_update (Django 2.2+) for every supported Django: one
+    UPDATE ... SET field = CASE WHEN pk = ... THEN ... END WHERE pk IN (...) per batch.
+    queryset may be a manager, fields are field names. Returns the number of updated rows.
+    """
+    queryset = queryset.all()
+    if hasattr(queryset, 'bulk_update'):
+        return queryset.bulk_update(objs, fields, batch_size) or 0
+    objs = list(objs)
+    if not objs:
+        return 0
+    meta = queryset.model._meta
+    fields = [meta.get_field(name) for name in fields]
+    cast = Cast is not None and connections[queryset.db].vendor == 'postgresql'
+    batch_size = batch_size or len(objs)
+    rows = 0
+    for i in range(0, len(objs), batch_size):
+        batch = objs[i:i + batch_size]
+        values = {}
+        for field in fields:
+            whens = []
+            for obj in batch:
+                value = getattr(obj, field.attname)
+                if not hasattr(value, 'resolve_expression'):
+                    value = Value(value, output_field=field)
+                    if cast:
+                        value = Cast(value, output_field=field)
+                whens.append(When(pk=obj.pk, then=value))
+            values[field.attname] = Case(*whens, output_field=field)
+        rows += queryset.filter(pk__in=[obj.pk for obj in batch]).update(**values)
+    return rows
@@ -0,0 +1,73 @@
+from django.http.response import StreamingHttpResponse, FileResponse
+
+import csv
+import tempfile
+
+
+__all__ = [
+    'iterate_queryset', 'stream_csv', 'write_xlsx', 'streaming_export_response',
+]
+
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+class Echo(object):
+    """ File-like object for csv.writer, returns the written line instead of buffering it """
+
+    def write(self, value):
+        return value
+
+
+def iterate_queryset(queryset, chunk_size=2000):
+    """ Iterate queryset using server-side cursors (where supported), without filling the result cache """
+    try:
+        return queryset.iterator(chunk_size=chunk_size)
+    except TypeError:
+        return queryset.iterator()
+
+
+def export_rows(resource, queryset, chunk_size=2000):
+    for obj in iterate_queryset(queryset, chunk_size):
+        yield resource.export_resource(obj)
+
+
+def stream_csv(resource, queryset, chunk_size=2000):
+    writer = csv.writer(Echo())
+    yield writer.writerow(resource.get_export_headers())
+    for row in export_rows(resource, queryset, chunk_size):
+        yield writer.writerow(row)
+
+
+def write_xlsx(resource, queryset, chunk_size=2000):
+    """
+    Write rows to a temporary file with write-only (constant memory) openpyxl workbook.
+    The whole workbook is written to disk before the response starts: it is served from
+    the file, not streamed while rows are read
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append([str(header) for header in resource.get_export_headers()])
+    for row in export_rows(resource, queryset, chunk_size):
+        sheet.append([value if isinstance(value, (int, float)) else str(value) for value in row])
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
+
+
+def streaming_export_response(resource, queryset, export_type='csv', filename='export', chunk_size=2000):
+    if 'xlsx' in export_type:
+        export_type = 'xlsx'
+        response = FileResponse(write_xlsx(resource, queryset, chunk_size), content_type=CONTENT_TYPES['xlsx'])
+    else:
+        export_type = 'csv'
+        response = StreamingHttpResponse(stream_csv(resource, queryset, chunk_size), content_type=CONTENT_TYPES['csv'])
+    response['Content-Disposition'] = 'attachment; filename="%s.%s"' % (filename, export_type)
+    return response
@@ -7,6 +7,11 @@ from django.contrib.sites.models import Site
 
 
 class StdImageFieldSerializer(serializers.ImageField):
+    """
+    Urls of all variations of StdImageField.
+    Site is resolved once per serializer context, variation names once per model field.
+    """
+    _variation_names = {}
 
     def to_native(self, obj):
         return self.get_variations_urls(obj)
@@ -14,16 +19,33 @@ class StdImageFieldSerializer(serializers.ImageField):
     def to_representation(self, obj):
         return self.get_variations_urls(obj)
 
+    def get_base_url(self):
+        context = self.context
+        base_url = context.get('_kernel_site_url')
+        if base_url is None:
+            base_url = str(Site.objects.get_current(context.get('request')))
+            if isinstance(context, dict):
+                context['_kernel_site_url'] = base_url
+        return base_url
+
+    @classmethod
+    def get_variation_names(cls, field):
+        names = cls._variation_names.get(field)
+        if names is None:
+            names = cls._variation_names[field] = tuple(getattr(field, 'variations', {}).keys())
+        return names
+
     def get_variations_urls(self, obj):
         return_object = {}
-        field = obj.field
-        if hasattr(field, 'variations'):
-            variations = field.variations
-            for key in variations.keys():
-                if hasattr(obj, key):
-                    field_obj = getattr(obj, key, None)
-                    if field_obj and hasattr(field_obj, 'url'):
-                        return_object[key] = '{0}{1}'.format(Site.objects.get_current(), field_obj.url)
+        if not obj:
+            return return_object
+        names = self.get_variation_names(obj.field)
+        if names:
+            base_url = self.get_base_url()
+            for key in names:
+                field_obj = getattr(obj, key, None)
+                if field_obj and hasattr(field_obj, 'url'):
+                    return_object[key] = '{0}{1}'.format(base_url, field_obj.url)
         return return_object
 
 
@@ -1,8 +1,95 @@
+from django.core.exceptions import ValidationError, FieldDoesNotExist
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
 from django_filters import Filter
-from django_filters.fields import Lookup
+from rest_framework import exceptions
+
+import base64
+import zlib
 
 
 class ListFilter(Filter):
+    """
+    List of values: "1,2,3" or zlib compressed "z:<urlsafe base64>" (at most `max_decompressed` bytes).
+    Values are deduplicated and coerced once. Above `threshold` values the filter is
+    IN (SELECT unnest(array)) on PostgreSQL, one array parameter instead of one per value,
+    and OR of IN (...) chunked by the backend parameter limit elsewhere.
+    A list which can not be decoded is a validation error (400).
+    """
+    threshold = 1000
+    sqlite_max_params = 999
+    max_decompressed = 1 << 20
+    compressed_prefix = 'z:'
+
+    def __init__(self, *args, **kwargs):
+        self.threshold = kwargs.pop('threshold', self.threshold)
+        super(ListFilter, self).__init__(*args, **kwargs)
+
+    @property
+    def lookup_name(self):
+        return getattr(self, 'field_name', None) or self.name
+
+    def decode(self, value):
+        if isinstance(value, (list, tuple)):
+            return value
+        if value.startswith(self.compressed_prefix):
+            data = value[len(self.compressed_prefix):]
+            decompressor = zlib.decompressobj()
+            value = decompressor.decompress(base64.urlsafe_b64decode(data + '=' * (-len(data) % 4)),
+                                            self.max_decompressed)
+            if decompressor.unconsumed_tail or not decompressor.eof:
+                raise ValueError('Compressed list is larger than {} bytes or truncated'.format(self.max_decompressed))
+            value = value.decode('utf-8')
+        return value.split(u',')
+
+    def get_chunk_size(self, connection):
+        """ Values per IN (...): max_query_params of the backend (Django 2.0+), 999 on older SQLite """
+        size = getattr(connection.features, 'max_query_params', None)
+        if size is None and connection.vendor == 'sqlite':
+            size = self.sqlite_max_params
+        return size
+
+    def get_values(self, qs, value):
+        try:
+            to_python = qs.model._meta.get_field(self.lookup_name).to_python
+        except FieldDoesNotExist:
+            to_python = str
+        values, seen = [], set()
+        for item in self.decode(value):
+            item = item.strip() if isinstance(item, str) else item
+            if item in ('', None):
+                continue
+            try:
+                item = to_python(item)
+            except (ValidationError, TypeError, ValueError):
+                continue
+            if item not in seen:
+                seen.add(item)
+                values.append(item)
+        return values
+
     def filter(self, qs, value):
-        value_list = value.split(u',')
-        return super(ListFilter, self).filter(qs, Lookup(value_list, 'in'))
\ No newline at end of file
+        if not value:
+            return qs
+        try:
+            values = self.get_values(qs, value)
+        except (ValueError, zlib.error) as e:
+            raise exceptions.ValidationError({self.lookup_name: [str(e)]})
+        lookup = '{}__in'.format(self.lookup_name)
+        connection = connections[qs.db]
+        chunk_size = self.get_chunk_size(connection)
+        if len(values) <= self.threshold:
+            qs = qs.filter(**{lookup: values})
+        elif connection.vendor == 'postgresql':
+            qs = qs.filter(**{lookup: RawSQL('SELECT unnest(%s)', (values, ))})
+        elif chunk_size and len(values) > chunk_size:
+            condition = Q()
+            for i in range(0, len(values), chunk_size):
+                condition |= Q(**{lookup: values[i:i + chunk_size]})
+            qs = qs.filter(condition)
+        else:
+            qs = qs.filter(**{lookup: values})
+        if self.distinct:
+            qs = qs.distinct()
+        return qs
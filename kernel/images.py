@@ -0,0 +1,191 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from django.db.models.fields.files import ImageFieldFile
+
+from stdimage.models import StdImageField, StdImageFieldFile
+
+from kernel.workers import process_pool
+
+import hashlib
+import logging
+import threading
+
+
+__all__ = [
+    'KernelStdImageField', 'render_variation', 'render_variations_later', 'get_executor', 'is_pending',
+]
+
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = set()
+PENDING_PREFIX = 'kernel:variations:pending:'
+
+
+def get_executor():
+    """
+    Executor for variations rendering, KERNEL_IMAGE_EXECUTOR:
+        thread   -- local thread pool (default)
+        process  -- process pool (kernel.workers.process_pool)
+        sync     -- no executor, render in request
+    """
+    global _executor
+    mode = getattr(settings, 'KERNEL_IMAGE_EXECUTOR', 'thread')
+    if mode == 'sync':
+        return None
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = getattr(settings, 'KERNEL_IMAGE_WORKERS', None)
+                _executor = process_pool(workers) if mode == 'process' else ThreadPoolExecutor(workers)
+    return _executor
+
+
+def pending_key(file_name):
+    return PENDING_PREFIX + hashlib.md5(file_name.encode('utf-8')).hexdigest()
+
+
+def mark_pending(file_name):
+    """ Recorded on write: variations of the file are being rendered in background """
+    _pending.add(file_name)
+    cache.set(pending_key(file_name), True, getattr(settings, 'KERNEL_IMAGE_PENDING_TIMEOUT', 3600))
+
+
+def mark_rendered(file_name):
+    _pending.discard(file_name)
+    cache.delete(pending_key(file_name))
+
+
+def is_pending(file_name):
+    return file_name in _pending or bool(cache.get(pending_key(file_name)))
+
+
+def render_variation(attr_class, file_name, variation, storage, replace=True):
+    return attr_class.render_variation(file_name, variation, replace=replace, storage=storage)
+
+
+def _done(name, remaining):
+    def callback(future):
+        if future.exception() is not None:
+            logger.error('Variation %s was not rendered', name, exc_info=future.exception())
+        if remaining is not None:
+            remaining.done()
+    return callback
+
+
+class _Remaining(object):
+    """ Variations of one file left to render, the file is marked rendered after the last one """
+
+    def __init__(self, file_name, count):
+        self.file_name = file_name
+        self.count = count
+        self.lock = threading.Lock()
+
+    def done(self):
+        with self.lock:
+            self.count -= 1
+            last = self.count == 0
+        if last:
+            mark_rendered(self.file_name)
+
+
+def submit_variation(attr_class, file_name, variation, storage, replace=True, remaining=None):
+    executor = get_executor()
+    name = attr_class.get_variation_name(file_name, variation['name'])
+    if executor is None:
+        render_variation(attr_class, file_name, variation, storage, replace)
+        if remaining is not None:
+            remaining.done()
+        return
+    executor.submit(render_variation, attr_class, file_name, variation, storage, replace).add_done_callback(
+        _done(name, remaining))
+
+
+def render_variations_later(file_name, variations, storage, attr_class=StdImageFieldFile, **kwargs):
+    """
+    `render_variations` hook of StdImageField: schedule rendering after commit,
+    return False so the field does not render them in the request.
+    """
+    if get_executor() is None or not variations:
+        return True
+    mark_pending(file_name)
+
+    def schedule():
+        remaining = _Remaining(file_name, len(variations))
+        for variation in variations.values():
+            submit_variation(attr_class, file_name, variation, storage, remaining=remaining)
+    transaction.on_commit(schedule)
+    return False
+
+
+class LazyVariationFieldFile(ImageFieldFile):
+    """
+    Variation file. Its url is trusted without asking the storage unless the source was written
+    less than KERNEL_IMAGE_PENDING_WINDOW seconds ago and is still marked pending; a pending
+    variation is rendered on access or replaced by the placeholder.
+    """
+
+    def __init__(self, instance, field, name, source_name, variation):
+        super(LazyVariationFieldFile, self).__init__(instance, field, name)
+        self.source_name = source_name
+        self.variation = variation
+
+    def is_pending(self):
+        modified = getattr(self.instance, 'modified_date', None)
+        window = getattr(settings, 'KERNEL_IMAGE_PENDING_WINDOW', 3600)
+        if modified is not None and (timezone.now() - modified).total_seconds() > window:
+            return False
+        states = self.instance.__dict__.setdefault('_kernel_variations_pending', {})
+        if self.source_name not in states:
+            states[self.source_name] = is_pending(self.source_name)
+        return states[self.source_name]
+
+    def ensure_rendered(self):
+        if not self.is_pending():
+            return True
+        if not getattr(settings, 'KERNEL_IMAGE_RENDER_ON_ACCESS', True):
+            return False
+        try:
+            render_variation(self.field.attr_class, self.source_name, self.variation, self.storage, False)
+            return True
+        except Exception:
+            logger.exception('Variation %s was not rendered', self.name)
+            return False
+
+    @property
+    def url(self):
+        if self.ensure_rendered():
+            return super(LazyVariationFieldFile, self).url
+        placeholder = getattr(settings, 'KERNEL_IMAGE_PLACEHOLDER', None)
+        return placeholder if placeholder else self.storage.url(self.source_name)
+
+
+class KernelStdImageField(StdImageField):
+    """
+    StdImageField with variations rendered in background (see get_executor)
+    and lazily on first access.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('render_variations', render_variations_later)
+        super(KernelStdImageField, self).__init__(*args, **kwargs)
+
+    def set_variations(self, instance=None, **kwargs):
+        if self.attname not in instance.__dict__:
+            return  # deferred: reading it here would query the row again from post_init
+        field = getattr(instance, self.name, None)
+        if field and field._committed:
+            for name, variation in self.variations.items():
+                variation_name = self.attr_class.get_variation_name(field.name, variation['name'])
+                setattr(field, name, LazyVariationFieldFile(instance, self, variation_name, field.name, variation))
+
+    def deconstruct(self):
+        name, path, args, kwargs = super(KernelStdImageField, self).deconstruct()
+        kwargs.pop('render_variations', None)
+        return name, 'stdimage.models.StdImageField', args, kwargs
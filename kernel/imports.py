@@ -0,0 +1,188 @@
+from collections import deque
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.db import connections, DatabaseError
+
+from kernel.workers import process_pool
+
+import csv
+import itertools
+import json
+import os
+
+
+__all__ = [
+    'read_rows', 'validate_chunk', 'Checkpoint', 'ErrorReport', 'bulk_import',
+]
+
+
+def read_rows(path, format=None):
+    """ Rows of a CSV / XLSX file as dicts by header, read lazily """
+    format = format or os.path.splitext(path)[1].lstrip('.').lower()
+    if format == 'xlsx':
+        from openpyxl import load_workbook
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            headers = [str(h) if h is not None else '' for h in next(rows, ())]
+            for row in rows:
+                yield dict(zip(headers, row))
+        finally:
+            workbook.close()
+    else:
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            for row in csv.DictReader(f):
+                yield row
+
+
+def _chunks(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def validate_chunk(label, start, rows):
+    """
+    Clean rows with the model export resource (import_export widgets) and Model.full_clean.
+    Runs in a worker process. Returns (start, [(line, values)], [(line, errors)]),
+    values are {attname: value} ready for the model constructor.
+    """
+    model = apps.get_model(label)
+    resource = model.get_export_class()()
+    fields = {f.name: f for f in model._meta.concrete_fields}
+    columns = [field for field in resource.get_fields() if field.attribute in fields
+               and not fields[field.attribute].primary_key]
+    valid, errors = [], []
+    for line, row in enumerate(rows, start):
+        values, row_errors = {}, {}
+        for column in columns:
+            if column.column_name not in row:
+                continue
+            try:
+                values[column.attribute] = column.clean(row)
+            except (ValueError, ValidationError) as e:
+                row_errors[column.column_name] = [str(e)]
+        if row.get('external_id') and 'external_id' not in values:
+            values['external_id'] = row['external_id']
+        if not row_errors:
+            obj = model(**values)
+            try:
+                obj.full_clean(exclude=[name for name in fields if name not in values], validate_unique=False)
+            except ValidationError as e:
+                row_errors = e.message_dict
+            else:
+                values = {fields[name].attname: getattr(obj, fields[name].attname) for name in values}
+        if row_errors:
+            errors.append((line, row_errors))
+        else:
+            valid.append((line, values))
+    return start, valid, errors
+
+
+class Checkpoint(object):
+    """ JSON progress file: rows written so far for a source file, rewritten atomically after every chunk """
+
+    def __init__(self, path, source, chunk_size):
+        self.path = path
+        stat = os.stat(source)
+        self.state = {'source': os.path.abspath(source), 'size': stat.st_size, 'mtime': stat.st_mtime,
+                      'chunk_size': chunk_size, 'rows': 0, 'created': 0, 'updated': 0, 'errors': 0}
+
+    def load(self):
+        """ Resume a checkpoint of the same unchanged source, returns rows to skip """
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        with open(self.path, encoding='utf-8') as f:
+            state = json.load(f)
+        if all(state.get(key) == self.state[key] for key in ('source', 'size', 'mtime', 'chunk_size')):
+            self.state = state
+        return self.state['rows']
+
+    def save(self, **done):
+        for key, value in done.items():
+            self.state[key] += value
+        if self.path:
+            tmp = '{}.tmp'.format(self.path)
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f)
+            os.replace(tmp, self.path)
+
+
+class ErrorReport(object):
+    """ CSV of rejected rows: line, column, message """
+
+    def __init__(self, path, append=False):
+        self.file = open(path, 'a' if append else 'w', newline='', encoding='utf-8') if path else None
+        self.writer = csv.writer(self.file) if self.file else None
+        if self.writer and not self.file.tell():
+            self.writer.writerow(['line', 'column', 'message'])
+
+    def write(self, line, errors):
+        if self.writer:
+            for column, messages in errors.items():
+                for message in messages:
+                    self.writer.writerow([line, column, message])
+
+    def close(self):
+        if self.file:
+            self.file.close()
+
+
+def _write_chunk(model, valid, report):
+    """ bulk_create / bulk_update of one validated chunk in one transaction per chunk """
+    try:
+        created, updated = model.upsert_by_external_id([values for line, values in valid], max(len(valid), 1))
+    except DatabaseError as e:
+        for line, values in valid:
+            report.write(line, {'': [str(e)]})
+        return 0, 0, len(valid)
+    return len(created), len(updated), 0
+
+
+def bulk_import(model, path, format=None, chunk_size=1000, workers=None, checkpoint=None, errors=None,
+                resume=True, progress=None):
+    """
+    Import a CSV / XLSX file into a KernelModel: rows are streamed in chunks, validated
+    in a process pool (kernel.workers.process_pool, workers=0 validates in process), matched
+    by external_id and written with bulk_create / bulk_update. `checkpoint` (JSON) makes the import resumable,
+    `errors` is the CSV report of rejected rows, progress(state) is called after every chunk.
+    Returns the checkpoint state.
+    """
+    state = Checkpoint(checkpoint, path, chunk_size)
+    skip = state.load() if resume else 0
+    report = ErrorReport(errors, append=bool(skip))
+    label = model._meta.label
+    rows = itertools.islice(read_rows(path, format), skip, None)
+    chunks = ((skip + 2 + i * chunk_size, chunk) for i, chunk in enumerate(_chunks(rows, chunk_size)))
+
+    def handle(result):
+        start, valid, invalid = result
+        for line, row_errors in invalid:
+            report.write(line, row_errors)
+        created, updated, failed = _write_chunk(model, valid, report) if valid else (0, 0, 0)
+        state.save(rows=len(valid) + len(invalid), created=created, updated=updated, errors=len(invalid) + failed)
+        if progress:
+            progress(state.state)
+
+    try:
+        if workers == 0:
+            for start, chunk in chunks:
+                handle(validate_chunk(label, start, chunk))
+        else:
+            connections.close_all()
+            with process_pool(workers) as executor:
+                pending = deque()
+                limit = (workers or os.cpu_count() or 1) * 2
+                for start, chunk in chunks:
+                    pending.append(executor.submit(validate_chunk, label, start, chunk))
+                    if len(pending) >= limit:
+                        handle(pending.popleft().result())
+                while pending:
+                    handle(pending.popleft().result())
+    finally:
+        report.close()
+    return state.state
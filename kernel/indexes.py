@@ -0,0 +1,95 @@
+from django.db.migrations.operations.base import Operation
+
+
+__all__ = [
+    'CreateIndex', 'published_index', 'unique_external_id',
+]
+
+
+def index_name(model_name, suffix):
+    """ Index names are limited to 30 characters """
+    return '{}_{}'.format(model_name.lower()[:29 - len(suffix)], suffix)
+
+
+class CreateIndex(Operation):
+    """
+    CREATE [UNIQUE] INDEX on model fields ('-field' is descending), optionally partial:
+    condition {field: int} becomes WHERE field = value on backends with partial indexes
+    (PostgreSQL, SQLite), elsewhere the index is created without it.
+    Works on every supported Django, models.Index / conditions / constraints are not needed.
+    """
+    reduces_to_sql = True
+    reversible = True
+    partial_vendors = ('postgresql', 'sqlite')
+
+    def __init__(self, model_name, name, fields, unique=False, condition=None):
+        self.model_name = model_name.lower()
+        self.name = name
+        self.fields = list(fields)
+        self.unique = unique
+        self.condition = dict(condition or {})
+
+    def deconstruct(self):
+        kwargs = {'model_name': self.model_name, 'name': self.name, 'fields': self.fields}
+        if self.unique:
+            kwargs['unique'] = True
+        if self.condition:
+            kwargs['condition'] = self.condition
+        return self.__class__.__name__, [], kwargs
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def create_sql(self, model, schema_editor):
+        quote = schema_editor.quote_name
+        columns = []
+        for field in self.fields:
+            column = quote(model._meta.get_field(field.lstrip('-')).column)
+            columns.append('{} DESC'.format(column) if field.startswith('-') else column)
+        sql = 'CREATE {}INDEX {} ON {} ({})'.format(
+            'UNIQUE ' if self.unique else '', quote(self.name), quote(model._meta.db_table), ', '.join(columns))
+        if self.condition and schema_editor.connection.vendor in self.partial_vendors:
+            sql += ' WHERE {}'.format(' AND '.join(
+                '{} = {:d}'.format(quote(model._meta.get_field(field).column), int(value))
+                for field, value in sorted(self.condition.items())))
+        return sql
+
+    def drop_sql(self, model, schema_editor):
+        if schema_editor.connection.vendor == 'mysql':
+            return 'DROP INDEX {} ON {}'.format(schema_editor.quote_name(self.name),
+                                                schema_editor.quote_name(model._meta.db_table))
+        return 'DROP INDEX {}'.format(schema_editor.quote_name(self.name))
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.execute(self.create_sql(model, schema_editor))
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.execute(self.drop_sql(model, schema_editor))
+
+    def describe(self):
+        return 'Create index {} on {} of {}'.format(self.name, ', '.join(self.fields), self.model_name)
+
+
+def published_index(model_name, partial=False, published_status=1):
+    """
+    Migration operation adding the index of published pages feed for a concrete KernelPage subclass:
+        (status, -created_date)                      -- composite
+        (-created_date) WHERE status = published     -- partial (PostgreSQL / SQLite, plain index elsewhere)
+
+        operations = [
+            published_index('article'),
+        ]
+    """
+    if partial:
+        return CreateIndex(model_name, index_name(model_name, 'pub_idx'), ['-created_date'],
+                           condition={'status': published_status})
+    return CreateIndex(model_name, index_name(model_name, 'status_idx'), ['status', '-created_date'])
+
+
+def unique_external_id(model_name):
+    """ Migration operation making external_id unique, once existing duplicates are resolved """
+    return CreateIndex(model_name, index_name(model_name, 'ext_uniq'), ['external_id'], unique=True)
@@ -0,0 +1,113 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+import itertools
+import smtplib
+import time
+
+
+__all__ = [
+    'mail_recipients', 'render_mail', 'send_bulk_mail',
+]
+
+
+def mail_recipients(email):
+    """ [email], or settings.DEBUG_EMAIL when SEND_EMAIL is off """
+    if settings.SEND_EMAIL:
+        return [email]
+    return list(settings.DEBUG_EMAIL)
+
+
+def render_mail(template, user, context=None, get_context=None, from_email=None, **kwargs):
+    """ EmailMessage of a templated_email template for one user, context gets `user` """
+    from templated_email import get_templated_mail
+    context = dict(context or {}, user=user)
+    if get_context is not None:
+        context.update(get_context(user))
+    return get_templated_mail(template_name=template, context=context,
+                              from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+                              to=mail_recipients(user.email), **kwargs)
+
+
+def _close(connection):
+    try:
+        connection.close()
+    except (smtplib.SMTPException, OSError):
+        pass
+
+
+def _transient(error):
+    """ 4xx replies and dropped connections are worth a retry, refused recipients and 5xx replies are not """
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return False
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    return not isinstance(error, smtplib.SMTPException)
+
+
+def _send(connection, messages, retries, retry_delay):
+    """
+    Send a batch over the open connection one message at a time. On transient errors (4xx replies,
+    socket errors) reconnect and retry the unsent message with backoff, permanent failures are
+    counted at once; messages already sent are never resent.
+    Returns (sent, failed).
+    """
+    sent = failed = 0
+    for message in messages:
+        for attempt in range(retries + 1):
+            try:
+                connection.open()
+                sent += connection.send_messages([message]) or 0
+                break
+            except (smtplib.SMTPException, OSError) as e:
+                if not _transient(e):
+                    failed += 1
+                    break
+                _close(connection)
+                if attempt == retries:
+                    failed += 1
+                else:
+                    time.sleep(retry_delay * 2 ** attempt)
+    return sent, failed
+
+
+def send_bulk_mail(template, users, context=None, get_context=None, from_email=None, batch_size=100,
+                   workers=4, rate=None, retries=3, retry_delay=1.0, connection=None, progress=None, **kwargs):
+    """
+    Render a templated_email template for every user in a thread pool (compiled templates are
+    shared by the cached template loader) and send batches over one reused backend connection.
+
+    rate: max messages per second, retries: per message with exponential backoff on transient errors,
+    progress(sent, failed) is called after every batch. Returns (sent, failed).
+    """
+    connection = connection or get_connection()
+    users = iter(users)
+    sent = failed = 0
+    started = time.monotonic()
+    connection.open()
+    try:
+        with ThreadPoolExecutor(workers) as executor:
+            while True:
+                batch = list(itertools.islice(users, batch_size))
+                if not batch:
+                    break
+                messages = list(executor.map(
+                    lambda user: render_mail(template, user, context, get_context, from_email, **kwargs), batch))
+                for message in messages:
+                    message.connection = connection
+                batch_sent, batch_failed = _send(connection, messages, retries, retry_delay)
+                sent += batch_sent
+                failed += batch_failed
+                if progress is not None:
+                    progress(sent, failed)
+                if rate:
+                    delay = (sent + failed) / float(rate) - (time.monotonic() - started)
+                    if delay > 0:
+                        time.sleep(delay)
+    finally:
+        _close(connection)
+    return sent, failed
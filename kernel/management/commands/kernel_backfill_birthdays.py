@@ -0,0 +1,43 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from kernel.db import bulk_update
+from kernel.managers.user import birth_day_of_year
+
+
+class Command(BaseCommand):
+    help = 'Recompute KernelUser.birth_int (leap-year day of year) for existing rows, as migration 0004 does'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        model = get_user_model()
+        manager = getattr(model, 'plain_objects', model._default_manager)
+        batch_size = options['batch_size']
+
+        cleared = manager.filter(date_birth__isnull=True, birth_int__isnull=False).update(birth_int=None)
+
+        updated, last_pk = 0, 0
+        queryset = manager.filter(date_birth__isnull=False).order_by('pk')
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk).values_list('pk', 'date_birth', 'birth_int')[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+            changed = []
+            for pk, date_birth, birth_int in batch:
+                value = birth_day_of_year(date_birth)
+                if birth_int != value:
+                    changed.append(model(pk=pk, birth_int=value))
+            if changed:
+                with transaction.atomic():
+                    bulk_update(manager, changed, ['birth_int'])
+                    if getattr(model, 'CACHE_TAGS', False):
+                        model.invalidate_bulk_cache(changed)
+                updated += len(changed)
+            self.stdout.write('\r{} updated, last id {}'.format(updated, last_pk), ending='')
+            self.stdout.flush()
+        self.stdout.write('')
+        self.stdout.write('Done: {} updated, {} cleared'.format(updated, cleared))
@@ -0,0 +1,52 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from rest_framework.renderers import JSONRenderer
+
+from kernel.rest import renderers
+from kernel.rest import sparse
+
+import timeit
+
+
+class Command(BaseCommand):
+    help = 'Compare serializer and renderer paths of a model list endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help='app_label.Model')
+        parser.add_argument('--rows', type=int, default=200)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options['model'])
+        except (ValueError, LookupError) as e:
+            raise CommandError(e)
+
+        serializer_class = model.serializer_class_list()
+        queryset = model._default_manager.all()[:options['rows']]
+        fields = sparse.plain_fields(serializer_class, model)
+
+        def serialize():
+            return serializer_class(list(queryset), many=True).data
+
+        def values():
+            return list(queryset.values(*fields))
+
+        cases = [
+            ('serializer + JSONRenderer', lambda: JSONRenderer().render(serialize())),
+            ('serializer + FastJSONRenderer', lambda: renderers.FastJSONRenderer().render(serialize())),
+        ]
+        if fields is not None:
+            cases.append(('values + FastJSONRenderer', lambda: renderers.FastJSONRenderer().render(values())))
+            if renderers.msgpack is not None:
+                cases.append(('values + MessagePackRenderer', lambda: renderers.MessagePackRenderer().render(values())))
+        else:
+            self.stdout.write('values() path is not available: serializer has computed fields')
+
+        baseline = None
+        for name, func in cases:
+            seconds = timeit.timeit(func, number=options['repeat']) / options['repeat']
+            baseline = baseline or seconds
+            self.stdout.write('{:<32} {:>9.2f} ms/page {:>9.0f} rows/s {:>6.2f}x'.format(
+                name, seconds * 1000, options['rows'] / seconds, baseline / seconds))
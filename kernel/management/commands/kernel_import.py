@@ -0,0 +1,39 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Bulk import a CSV / XLSX file into a kernel model, matched by external_id'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help='app_label.Model')
+        parser.add_argument('path', help='CSV or XLSX file')
+        parser.add_argument('--format', default=None, choices=['csv', 'xlsx'])
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Validation processes (default: cpu count, 0: validate in process)')
+        parser.add_argument('--checkpoint', default=None, help='JSON progress file (default: <path>.checkpoint.json)')
+        parser.add_argument('--errors', default=None, help='CSV error report (default: <path>.errors.csv)')
+        parser.add_argument('--restart', action='store_true', default=False, help='Ignore an existing checkpoint')
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options['model'])
+        except (ValueError, LookupError) as e:
+            raise CommandError(e)
+        if not hasattr(model, 'bulk_import'):
+            raise CommandError('{} is not a kernel model'.format(model._meta.label))
+
+        def progress(state):
+            self.stdout.write('\r{rows} rows: {created} created, {updated} updated, {errors} errors'.format(**state),
+                              ending='')
+            self.stdout.flush()
+
+        path = options['path']
+        state = model.bulk_import(
+            path, format=options['format'], chunk_size=options['chunk_size'], workers=options['workers'],
+            checkpoint=options['checkpoint'] or '{}.checkpoint.json'.format(path),
+            errors=options['errors'] or '{}.errors.csv'.format(path),
+            resume=not options['restart'], progress=progress)
+        self.stdout.write('')
+        self.stdout.write('Done: {rows} rows, {created} created, {updated} updated, {errors} errors'.format(**state))
@@ -0,0 +1,43 @@
+from concurrent.futures import as_completed
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from kernel.images import render_variation
+from kernel.workers import process_pool
+
+
+class Command(BaseCommand):
+    help = 'Render StdImageField variations in bulk across processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('field', help='app_label.Model.field')
+        parser.add_argument('--replace', action='store_true', default=False, help='Replace existing variations')
+        parser.add_argument('--workers', type=int, default=None, help='Number of processes (default: cpu count)')
+
+    def handle(self, *args, **options):
+        try:
+            app_label, model_name, field_name = options['field'].split('.')
+            model = apps.get_model(app_label, model_name)
+            field = model._meta.get_field(field_name)
+        except (ValueError, LookupError) as e:
+            raise CommandError('Field "{}" not found: {}'.format(options['field'], e))
+
+        names = [name for name in model._default_manager.exclude(**{field_name: ''}).exclude(**{field_name: None})
+                 .values_list(field_name, flat=True).iterator() if name]
+        connections.close_all()
+
+        rendered = failed = 0
+        with process_pool(options['workers']) as executor:
+            futures = [
+                executor.submit(render_variation, field.attr_class, name, variation, field.storage, options['replace'])
+                for name in names for variation in field.variations.values()
+            ]
+            for future in as_completed(futures):
+                if future.exception() is None:
+                    rendered += 1
+                else:
+                    failed += 1
+                    self.stderr.write(str(future.exception()))
+        self.stdout.write('Rendered: {}, failed: {}'.format(rendered, failed))
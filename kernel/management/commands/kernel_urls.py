@@ -0,0 +1,60 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from kernel.constructors import KernelUriModel
+from kernel.registry import registry
+
+import time
+
+
+HEADER = '''# Generated by manage.py kernel_urls, do not edit.
+# Views are created on the first request to the route.
+from django.conf.urls import url
+
+from kernel.constructors.uri import lazy_view
+
+
+urlpatterns = [
+'''
+
+
+class Command(BaseCommand):
+    help = 'Measure URLconf build time of kernel models and emit a static urls module'
+
+    def add_arguments(self, parser):
+        parser.add_argument('models', nargs='*', help='app_label.Model (default: every kernel model)')
+        parser.add_argument('--output', default=None, help='Write the static urls module to this path')
+
+    def get_models(self, labels):
+        if not labels:
+            return [m for m in apps.get_models() if issubclass(m, KernelUriModel)]
+        try:
+            return [apps.get_model(label) for label in labels]
+        except (ValueError, LookupError) as e:
+            raise CommandError(e)
+
+    def handle(self, *args, **options):
+        models = self.get_models(options['models'])
+        lines, total = [], 0.0
+        for model in models:
+            registry.invalidate(model)
+            start = time.perf_counter()
+            patterns = model.urls()
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            model.urls()
+            warm = time.perf_counter() - start
+            total += cold
+            self.stdout.write('{:<40} {:>3} routes {:>9.2f} ms cold {:>9.3f} ms cached'.format(
+                model._meta.label, len(patterns), cold * 1000, warm * 1000))
+            for kind, pattern in zip(model.route_kinds(), patterns):
+                lines.append('    url({!r}, lazy_view({!r}, {!r}), name={!r}),\n'.format(
+                    pattern.regex.pattern, model._meta.label, kind, pattern.name))
+        self.stdout.write('{} models, {:.2f} ms'.format(len(models), total * 1000))
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                f.write(HEADER)
+                f.writelines(lines)
+                f.write(']\n')
+            self.stdout.write('Written {} routes to {}'.format(len(lines), options['output']))
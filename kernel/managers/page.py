@@ -1,6 +1,21 @@
 from django.db import models
 
 
-class PublishedManager(models.Manager):
-    def get_query_set(self):
-        return super(PublishedManager, self).get_query_set().filter(status='published')
\ No newline at end of file
+class PageQuerySet(models.QuerySet):
+
+    def published(self):
+        return self.filter(status=self.model.PUBLISHED_STATUS).order_by('-created_date')
+
+
+class PageManager(models.Manager.from_queryset(PageQuerySet)):
+    pass
+
+
+class PublishedManager(PageManager):
+
+    def get_queryset(self):
+        return super(PublishedManager, self).get_queryset().published()
+
+    def count_cached(self, timeout=None):
+        """ Number of published pages, cached until any page is saved or deleted """
+        return self.model.cache_list_fragment('published_count', lambda: self.get_queryset().count(), timeout)
@@ -1,12 +1,71 @@
+from django.conf import settings
 from django.contrib.auth.models import (AbstractBaseUser, BaseUserManager, PermissionsMixin)
+from django.db import transaction
+from django.db.models import Q, F, Case, When, IntegerField
 from django.utils import timezone
 from polymorphic.models import PolymorphicManager
+from polymorphic.query import PolymorphicQuerySet
+
+from kernel import cache as kcache
+
+import calendar
+import datetime
+
+
+def birth_day_of_year(value):
+    """ Day of year of a birth date in a leap year: Feb 29 is always 60, Mar 1 always 61 """
+    return datetime.date(2000, value.month, value.day).timetuple().tm_yday
+
+
+LEAP_DAY = 60
+
+
+class EmailUserQuerySet(PolymorphicQuerySet):
+
+    def update(self, **kwargs):
+        """ update() bypasses save(): cached user snapshots (KERNEL_USER_CACHE) of the rows are invalidated """
+        pks = list(self.values_list('pk', flat=True)) if getattr(settings, 'KERNEL_USER_CACHE', False) else ()
+        rows = super(EmailUserQuerySet, self).update(**kwargs)
+        if pks:
+            from kernel.backends import user_cache_tag
+            transaction.on_commit(lambda: kcache.bump_tags(*[user_cache_tag(pk) for pk in pks]), using=self.db)
+        return rows
+
+    def birthdays(self, days=7, today=None):
+        """
+        Users with a birthday from `today` to `today + days` inclusive, ordered by the nearest one,
+        with wraparound at the year end. A range on the indexed birth_int; in non-leap years
+        Feb 29 birthdays are celebrated on Feb 28.
+        """
+        today = today or timezone.localtime(timezone.now()).date()
+        last = today + datetime.timedelta(days=days)
+        start = birth_day_of_year(today)
+        if days >= 365:
+            return self._birthday_order(self.filter(birth_int__isnull=False), start)
+        end = birth_day_of_year(last)
+        if start <= end:
+            condition = Q(birth_int__gte=start, birth_int__lte=end)
+        else:
+            condition = Q(birth_int__gte=start) | Q(birth_int__lte=end)
+        if any(not calendar.isleap(year) and today <= datetime.date(year, 2, 28) <= last
+               for year in range(today.year, last.year + 1)):
+            condition |= Q(birth_int=LEAP_DAY)
+        return self._birthday_order(self.filter(condition), start)
+
+    @staticmethod
+    def _birthday_order(queryset, start):
+        return queryset.annotate(birthday_offset=Case(
+            When(birth_int__gte=start, then=F('birth_int') - start),
+            default=F('birth_int') + 366 - start,
+            output_field=IntegerField(),
+        )).order_by('birthday_offset', 'pk')
 
 
 class EmailUserMixinManager(PolymorphicManager, BaseUserManager):
     """
     Custom manager for EmailUser.
     """
+    queryset_class = EmailUserQuerySet
 
     def _create_user(self, email, password, is_staff, is_superuser, **extra_fields):
         """
@@ -48,3 +107,27 @@ class EmailUserMixinManager(PolymorphicManager, BaseUserManager):
         :return custom_user.models.EmailUser user: admin user
         """
         return self._create_user(email, password, True, True, **extra_fields)
+
+    def birthdays(self, days=7, today=None):
+        return self.get_queryset().birthdays(days, today)
+
+    def send_email(self, template, context=None, queryset=None, chunk_size=2000, **kwargs):
+        """
+        Send a templated email to every is_emailing user (of `queryset`) in batches over one
+        connection, see kernel.mail.send_bulk_mail for batch_size, workers, rate, retries, progress.
+        :return tuple: (sent, failed)
+        """
+        from kernel.mail import send_bulk_mail
+        from kernel.export import iterate_queryset
+        queryset = (self.get_queryset() if queryset is None else queryset).filter(is_emailing=True).order_by('pk')
+        return send_bulk_mail(template, iterate_queryset(queryset, chunk_size), context, **kwargs)
+
+
+class EmailUserBaseManager(EmailUserMixinManager):
+    """
+    Non-polymorphic access to users: rows are returned as the base class,
+    without content type resolution and child table queries.
+    """
+
+    def get_queryset(self):
+        return super(EmailUserBaseManager, self).get_queryset().non_polymorphic()
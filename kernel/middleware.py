@@ -2,46 +2,144 @@ from django.contrib.auth import get_user_model
 
 import threading
 
+try:
+    from contextvars import ContextVar
+except ImportError:
+    ContextVar = None
+
+try:
+    from asyncio import iscoroutinefunction
+except ImportError:
+    def iscoroutinefunction(func):
+        return False
+
+
+class ThreadLocalVar(object):
+    """ ContextVar interface (get / set / reset) on a thread local, for Python < 3.7 """
+
+    def __init__(self, name, default=None):
+        self.name = name
+        self.default = default
+        self._local = threading.local()
+
+    class Token(object):
+        __slots__ = ('old_value', )
+
+        def __init__(self, old_value):
+            self.old_value = old_value
+
+    def get(self):
+        return getattr(self._local, 'value', self.default)
+
+    def set(self, value):
+        token = self.Token(self.get())
+        self._local.value = value
+        return token
+
+    def reset(self, token):
+        self._local.value = token.old_value
+
+
+if ContextVar is not None:
+    _request_context = ContextVar('kernel_request_context', default=None)
+else:
+    _request_context = ThreadLocalVar('kernel_request_context', default=None)
+
+
+class RequestContext(object):
+    """ Request and user of the current sync / async execution context """
+    __slots__ = ('request', '_user')
+
+    def __init__(self, request=None, user=None):
+        self.request = request
+        self._user = user
+
+    @property
+    def user(self):
+        if self._user is None and self.request is not None:
+            return getattr(self.request, 'user', None)
+        return self._user
+
+    @user.setter
+    def user(self, value):
+        self._user = value
+
 
 class CrequestMiddleware(object):
     """ Always have access to the current user """
-    __users = {}
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None):
+        self.get_response = get_response
+        self.is_async = get_response is not None and iscoroutinefunction(get_response)
+        if self.is_async:
+            from asgiref.sync import markcoroutinefunction
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            from kernel.middleware_async import acall
+            return acall(self, request, _request_context, RequestContext)
+        token = _request_context.set(RequestContext(request))
+        try:
+            return self.get_response(request)
+        finally:
+            _request_context.reset(token)
 
     def process_request(self, request):
-        """ Store user info """
-        self.__class__.set_user(request.user)
+        """ Store request info (MIDDLEWARE_CLASSES) """
+        request._kernel_context_token = _request_context.set(RequestContext(request))
 
     def process_response(self, request, response):
-        """ Delete user info """
-        self.__class__.del_user()
+        """ Delete request info (MIDDLEWARE_CLASSES) """
+        self.__class__._reset(request)
         return response
 
     def process_exception(self, request, exception):
-        """ Delete user info """
-        self.__class__.del_user()
+        """ Delete request info (MIDDLEWARE_CLASSES) """
+        self.__class__._reset(request)
+
+    @staticmethod
+    def _reset(request):
+        token = getattr(request, '_kernel_context_token', None)
+        if token is not None:
+            del request._kernel_context_token
+            try:
+                _request_context.reset(token)
+            except ValueError:
+                _request_context.set(None)
+
+    @staticmethod
+    def get_context():
+        return _request_context.get()
 
     @staticmethod
     def get_request():
-        return threading.current_thread()
+        context = _request_context.get()
+        return context.request if context is not None else None
 
     @classmethod
     def get_user(cls, default=None):
         """ Retrieve user info """
-        return cls.__users.get(threading.current_thread(), default)
+        context = _request_context.get()
+        if context is None:
+            return default
+        user = context.user
+        return default if user is None else user
 
     @classmethod
     def set_user(cls, user):
         """ Store user info """
         if isinstance(user, str):
-            user = get_user_model().objects.get(username=user)
-        cls.__users[threading.current_thread()] = user
+            user = get_user_model().objects.get(**{get_user_model().USERNAME_FIELD: user})
+        context = _request_context.get()
+        if context is None:
+            _request_context.set(RequestContext(user=user))
+        else:
+            context.user = user
 
     @classmethod
     def del_user(cls):
         """ Delete user info """
-        cls.__users.pop(threading.current_thread(), None)
-
-
-
-
-
+        _request_context.set(None)
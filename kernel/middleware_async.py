@@ -0,0 +1,12 @@
+"""
+Async branch of CrequestMiddleware, kept out of kernel.middleware
+so that the module still imports on Python versions without async / await
+"""
+
+
+async def acall(middleware, request, context_var, context_class):
+    token = context_var.set(context_class(request))
+    try:
+        return await middleware.get_response(request)
+    finally:
+        context_var.reset(token)
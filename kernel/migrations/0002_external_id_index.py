@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kernel', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='kerneluser',
+            name='external_id',
+            field=models.CharField(db_index=True, default=uuid.uuid4, editable=False, max_length=120, verbose_name='Внешний ключ'),
+        ),
+    ]
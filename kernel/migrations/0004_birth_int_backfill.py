@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+import collections
+import datetime
+
+
+BATCH_SIZE = 2000
+
+
+def recompute_birth_int(apps, schema_editor):
+    """ birth_int as the day of year of date_birth in a leap year (Feb 29 is 60) """
+    model = apps.get_model('kernel', 'KernelUser')
+    manager = model._base_manager.db_manager(schema_editor.connection.alias)
+    manager.filter(date_birth__isnull=True, birth_int__isnull=False).update(birth_int=None)
+    queryset = manager.filter(date_birth__isnull=False).order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(queryset.filter(pk__gt=last_pk).values_list('pk', 'date_birth', 'birth_int')[:BATCH_SIZE])
+        if not batch:
+            break
+        last_pk = batch[-1][0]
+        changed = collections.defaultdict(list)
+        for pk, date_birth, birth_int in batch:
+            value = datetime.date(2000, date_birth.month, date_birth.day).timetuple().tm_yday
+            if birth_int != value:
+                changed[value].append(pk)
+        # One UPDATE per distinct day of the batch, at most 366
+        for value, pks in changed.items():
+            manager.filter(pk__in=pks).update(birth_int=value)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kernel', '0003_birth_int_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(recompute_birth_int, migrations.RunPython.noop),
+    ]
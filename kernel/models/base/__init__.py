@@ -3,13 +3,18 @@ from django.conf import settings
 from django.utils.translation import ugettext_lazy as _
 from django.utils.encoding import python_2_unicode_compatible
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
 # Import kernel module
 from kernel.middleware import CrequestMiddleware
 from kernel import filters as kf
 from kernel import constructors as kc
+from kernel.registry import cached_class
+from kernel import cache as kcache
+from kernel.db import bulk_update
+from kernel import conditional  # watches deletes of CONDITIONAL_GET models
 
 import uuid
-import re
 
 __all__ = [
     'KernelByModel', 'KernelModel'
@@ -20,7 +25,7 @@ __all__ = [
 class KernelModel(kc.ActionKernelModel, kc.KernelPermalinkModel, kc.KernelViewsModel,
                   kc.KernelSerializerModel, kc.KernelUriModel, models.Model):
 
-    external_id = models.CharField(_('Внешний ключ'), max_length=120, editable=False, default=uuid.uuid4)
+    external_id = models.CharField(_('Внешний ключ'), max_length=120, editable=False, default=uuid.uuid4, db_index=True)
     created_date = models.DateTimeField(_('Создан'), auto_now_add=True)
     modified_date = models.DateTimeField(_('Изменен'), auto_now=True)
 
@@ -28,6 +33,13 @@ class KernelModel(kc.ActionKernelModel, kc.KernelPermalinkModel, kc.KernelViewsM
     REST = False
     ADMIN = False
     EXPORT = False
+    EXPORT_STREAM = False
+    EXPORT_CHUNK_SIZE = 2000
+    KEYSET_ORDERING = None
+    KEYSET_COUNT = None
+    CACHE_TAGS = False
+    BULK_LOOKUP = 'external_id'
+    CONDITIONAL_GET = False
     MODELFORM = False
     MODELFORM_SUBMIT = None
 
@@ -35,6 +47,71 @@ class KernelModel(kc.ActionKernelModel, kc.KernelPermalinkModel, kc.KernelViewsM
         abstract = True
 
     @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(KernelModel, cls).from_db(db, field_names, values)
+        if cls.CACHE_TAGS:
+            instance._loaded_cache_tags = instance.cache_tags()
+        return instance
+
+    def save(self, *args, **kwargs):
+        super(KernelModel, self).save(*args, **kwargs)
+        if self.CACHE_TAGS:
+            self.invalidate_cache()
+
+    def delete(self, *args, **kwargs):
+        tags = self.cache_tags() if self.CACHE_TAGS else None
+        result = super(KernelModel, self).delete(*args, **kwargs)
+        if tags:
+            self.invalidate_cache(tags)
+        return result
+
+    def prepare_bulk(self, created):
+        """
+        Field values save() would fill, for bulk_create / bulk_update which bypass save().
+        Returns names of the filled fields, they are written with the updated ones
+        """
+        if created and hasattr(self, 'pre_save_polymorphic'):
+            self.pre_save_polymorphic(self._state.db or 'default')
+        return []
+
+    @classmethod
+    def cache_tag(cls):
+        return '{}.{}'.format(cls._meta.app_label, cls._meta.model_name)
+
+    def cache_tags(self):
+        """ Tags of cached data which depends on this object """
+        return ['{}:pk:{}'.format(self.cache_tag(), self.pk)]
+
+    @classmethod
+    def list_cache_tags(cls):
+        """ Tags of cached data which depends on any object of the model """
+        return ['{}:list'.format(cls.cache_tag())]
+
+    def invalidate_cache(self, tags=None):
+        tags = set(tags or self.cache_tags()) | set(getattr(self, '_loaded_cache_tags', ())) | set(self.list_cache_tags())
+        self._loaded_cache_tags = self.cache_tags()
+        transaction.on_commit(lambda: kcache.bump_tags(*tags), using=self._state.db)
+
+    @classmethod
+    def invalidate_bulk_cache(cls, objects):
+        """ Invalidation after bulk writes, which bypass save() and delete() """
+        tags = set(cls.list_cache_tags())
+        for obj in objects:
+            tags.update(obj.cache_tags())
+            tags.update(getattr(obj, '_loaded_cache_tags', ()))
+        transaction.on_commit(lambda: kcache.bump_tags(*tags))
+
+    def cache_fragment(self, name, builder, timeout=None):
+        """ Cache builder() until this object changes """
+        return kcache.get_or_set('{}:{}:{}'.format(self.cache_tag(), self.pk, name), self.cache_tags(), builder, timeout)
+
+    @classmethod
+    def cache_list_fragment(cls, name, builder, timeout=None):
+        """ Cache builder() until any object of the model changes """
+        return kcache.get_or_set('{}:list:{}'.format(cls.cache_tag(), name), cls.list_cache_tags(), builder, timeout)
+
+    @classmethod
+    @cached_class
     def admin_class(cls):
         from kernel.admin.kernel import BaseAdmin
         return type("{}Admin".format(cls.__name__), (BaseAdmin, ), {})
@@ -49,6 +126,7 @@ class KernelModel(kc.ActionKernelModel, kc.KernelPermalinkModel, kc.KernelViewsM
         return self._meta.get_field(_name).verbose_name
 
     @classmethod
+    @cached_class
     def get_export_class(cls):
         from import_export import resources
         from import_export import fields
@@ -68,6 +146,7 @@ class KernelModel(kc.ActionKernelModel, kc.KernelPermalinkModel, kc.KernelViewsM
         return None
 
     @classmethod
+    @cached_class
     def get_modelform_class(cls):
         if 'crispy_forms' in settings.INSTALLED_APPS and cls.MODELFORM:
             from django import forms
@@ -119,8 +198,10 @@ class KernelModel(kc.ActionKernelModel, kc.KernelPermalinkModel, kc.KernelViewsM
         return [f.name for f in cls._meta.get_fields() if not f.related_model]
 
     @classmethod
+    @cached_class
     def filter_class(cls):
         import rest_framework_filters as filters
+        import django_filters
 
         class FilterClass(filters.FilterSet):
             id_list = kf.ListFilter(name='id')
@@ -145,15 +226,76 @@ class KernelModel(kc.ActionKernelModel, kc.KernelPermalinkModel, kc.KernelViewsM
 
         return FilterClass
 
+    @classmethod
+    def in_bulk_by(cls, field, values, chunk_size=1000, queryset=None):
+        """ {value: object} by a (unique) field, one query per chunk of values """
+        queryset = cls._default_manager.all() if queryset is None else queryset
+        values = list({str(value) for value in values if value is not None})
+        result = {}
+        for i in range(0, len(values), chunk_size):
+            for obj in queryset.filter(**{'{}__in'.format(field): values[i:i + chunk_size]}):
+                result[str(getattr(obj, field))] = obj
+        return result
+
+    @classmethod
+    def in_bulk_by_external_id(cls, external_ids, chunk_size=1000, queryset=None):
+        return cls.in_bulk_by('external_id', external_ids, chunk_size, queryset)
 
+    @classmethod
+    def upsert_by_external_id(cls, rows, batch_size=500):
+        """
+        Create or update objects from dicts of field values matched by external_id,
+        written with bulk_create / bulk_update in one transaction per batch.
+        Rows repeating an external_id are merged into one object, the last value wins.
+        Returns (created, updated) objects.
+        """
+        created, updated = [], []
+        for i in range(0, len(rows), batch_size):
+            batch = rows[i:i + batch_size]
+            existing = cls.in_bulk_by_external_id([row.get('external_id') for row in batch], batch_size)
+            to_create, to_update, fields, pending, changed = [], [], set(), {}, set()
+            for row in batch:
+                key = row.get('external_id')
+                key = str(key) if key not in (None, '') else None
+                obj = existing.get(key) if key is not None else None
+                if obj is None:
+                    if key in pending:
+                        for name, value in row.items():
+                            setattr(pending[key], name, value)
+                        continue
+                    obj = cls(**row)
+                    to_create.append(obj)
+                    if key is not None:
+                        pending[key] = obj
+                    continue
+                for name, value in row.items():
+                    if name != 'external_id':
+                        setattr(obj, name, value)
+                        fields.add(name)
+                if obj.pk not in changed:
+                    changed.add(obj.pk)
+                    to_update.append(obj)
+            for obj in to_create:
+                obj.prepare_bulk(True)
+            now = timezone.now()
+            for obj in to_update:
+                obj.modified_date = now
+                fields.update(obj.prepare_bulk(False))
+            with transaction.atomic():
+                cls._default_manager.bulk_create(to_create)
+                if to_update:
+                    bulk_update(cls._default_manager, to_update, fields | {'modified_date'})
+            created.extend(to_create)
+            updated.extend(to_update)
+        if cls.CACHE_TAGS:
+            cls.invalidate_bulk_cache(created + updated)
+        return created, updated
 
     @classmethod
-    def urls(cls):
-        uri_list = []
-        for m in [x for x in dir(cls)]:
-            if re.match('get_uri_', m) and not m == 'get_uri_crud':
-                uri_list.append(getattr(cls, m)())
-        return uri_list
+    def bulk_import(cls, path, **kwargs):
+        """ Bulk import of a CSV / XLSX file, see kernel.imports.bulk_import """
+        from kernel.imports import bulk_import
+        return bulk_import(cls, path, **kwargs)
 
     @classmethod
     def get_namespace(cls):
@@ -175,20 +317,29 @@ class KernelByModel(KernelModel):
         abstract = True
 
     def save(self, *args, **kwargs):
-        if not self.created_by:
+        user = CrequestMiddleware.get_user()
+        if not self.created_by_id:
             try:
-                user = CrequestMiddleware.get_user()
                 self.created_by = user
             except:
                  pass
-        if not self.modified_by:
+        if not self.modified_by_id:
             try:
-                user = CrequestMiddleware.get_user()
                 self.modified_by = user
             except:
                 pass
         super(KernelByModel, self).save(*args, **kwargs)
 
+    @classmethod
+    def lazy_queryset(cls):
+        """
+        Every foreign key joined, as select_related() did; users are joined as base
+        KernelUser rows, without polymorphic queries per row
+        """
+        related = [f.name for f in cls._meta.concrete_fields
+                   if isinstance(f, models.ForeignKey) and not f.remote_field.parent_link]
+        return cls.objects.select_related(*related)
+
     @classmethod
     def list_display(cls):
         return 'id', 'external_id', 'created_by'
@@ -1,4 +1,3 @@
-from django.core.cache import cache
 from django.utils.html import strip_tags
 from django.db import models
 from django.conf import settings
@@ -6,12 +5,14 @@ from django.utils.translation import ugettext_lazy as _
 from django.utils.encoding import python_2_unicode_compatible
 from django.template.defaultfilters import truncatechars_html
 # Import over module
-from stdimage.models import StdImageField
 from ckeditor_uploader.fields import RichTextUploadingField
 # Import kernel module
 from kernel.utils import upload_dir, slugify
+from kernel.images import KernelStdImageField
 from kernel import managers as kman
 from kernel.models.base import KernelByModel
+from kernel import cache as kcache
+from kernel.counters import view_counter
 
 
 __all__ = [
@@ -48,7 +49,7 @@ class KernelPage(KernelByModel):
         _('URL'), help_text=_('Использовать в качестве урла транскрипцию ключевых слов'),
         max_length=140, unique=True, blank=True
     )
-    image = StdImageField(
+    image = KernelStdImageField(
         upload_to=upload_dir,
         null=True, blank=True,
         variations=IMAGE_VARIATIONS,
@@ -61,7 +62,9 @@ class KernelPage(KernelByModel):
 
     views = models.IntegerField(default=0)
 
-    objects = models.Manager()
+    CACHE_TAGS = True
+
+    objects = kman.PageManager()
     published = kman.PublishedManager()
 
     class Meta:
@@ -71,10 +74,36 @@ class KernelPage(KernelByModel):
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.title)
-        cache.clear()
         obj = super(KernelPage, self).save(*args, **kwargs)
         return obj
 
+    def prepare_bulk(self, created):
+        fields = super(KernelPage, self).prepare_bulk(created)
+        if not self.slug:
+            self.slug = slugify(self.title)
+            fields.append('slug')
+        return fields
+
+    @classmethod
+    def slug_cache_tag(cls, slug):
+        return '{}:slug:{}'.format(cls.cache_tag(), slug)
+
+    def cache_tags(self):
+        tags = super(KernelPage, self).cache_tags()
+        if self.__dict__.get('slug'):
+            tags.append(self.slug_cache_tag(self.__dict__['slug']))
+        return tags
+
+    @classmethod
+    def list_cache_tags(cls):
+        return super(KernelPage, cls).list_cache_tags() + ['{}:published'.format(cls.cache_tag())]
+
+    @classmethod
+    def cache_detail_fragment(cls, slug, name, builder, timeout=None):
+        """ Cache page detail fragment by slug, before the page itself is loaded """
+        return kcache.get_or_set('{}:slug:{}:{}'.format(cls.cache_tag(), slug, name), [cls.slug_cache_tag(slug)],
+                                 builder, timeout)
+
     @classmethod
     def list_display(cls):
         return 'id',  'title', 'longtitle', 'status',
@@ -87,6 +116,14 @@ class KernelPage(KernelByModel):
            #(_('Дополнительно'), {'fields': ('order', )}),
         )
 
+    def hit(self, count=1):
+        """ Count a page view, written later in a batch without save() """
+        view_counter.incr(self, count)
+
+    @property
+    def views_count(self):
+        return self.views + view_counter.pending(self)
+
     @property
     def word_count(self):
         return len(strip_tags(self.content))
@@ -6,14 +6,15 @@ from django.utils.translation import ugettext_lazy as _
 from django.utils.encoding import python_2_unicode_compatible
 # Import over module
 from polymorphic.models import PolymorphicModel
-from stdimage.models import StdImageField
 from templated_email import send_templated_mail, get_templated_mail
 # Import kernel module
 from kernel.constant import Lang
-from kernel.managers.user import EmailUserMixinManager
+from kernel.managers.user import EmailUserMixinManager, EmailUserBaseManager, birth_day_of_year
 from kernel.utils import upload_dir, slugify
+from kernel.images import KernelStdImageField
 from kernel.models.base import KernelModel
 from kernel import filters as kf
+from kernel.registry import cached_class
 
 
 
@@ -40,7 +41,7 @@ class KernelUser(PolymorphicModel, AbstractBaseUser, PermissionsMixin, KernelMod
 
     phone = models.CharField(_('Телефон'), max_length=30, blank=True)
     date_birth = models.DateField(null=True, blank=True)
-    birth_int = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    birth_int = models.PositiveIntegerField(null=True, blank=True, editable=False, db_index=True)
 
     date_joined = models.DateTimeField(_('date joined'), default=timezone.now)
 
@@ -48,13 +49,14 @@ class KernelUser(PolymorphicModel, AbstractBaseUser, PermissionsMixin, KernelMod
     is_active = models.BooleanField(_('active'), default=True, help_text=Lang.MU_AH3)
     is_emailing = models.BooleanField(_('Is emailing'), default=True)
 
-    photo = StdImageField(upload_to=upload_dir, blank=True,
-                          variations={'promotion': (775, 775, True),
-                                      'large': (600, 600),
-                                      'thumbnail': (75, 75, True),
-                                      'medium': (300, 300)})
+    photo = KernelStdImageField(upload_to=upload_dir, blank=True,
+                                variations={'promotion': (775, 775, True),
+                                            'large': (600, 600),
+                                            'thumbnail': (75, 75, True),
+                                            'medium': (300, 300)})
 
     objects = EmailUserMixinManager()
+    plain_objects = EmailUserBaseManager()
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = []
@@ -62,6 +64,8 @@ class KernelUser(PolymorphicModel, AbstractBaseUser, PermissionsMixin, KernelMod
     REST = True
     ADMIN = True
     MODELFORM = True
+    CACHE_TAGS = True
+    NON_POLYMORPHIC = False
     ROUTE_NAME = 'users'
 
     class Meta:
@@ -72,10 +76,17 @@ class KernelUser(PolymorphicModel, AbstractBaseUser, PermissionsMixin, KernelMod
         ordering = ['-last_name', ]
 
     def save(self, *args, **kwargs):
-        if self.date_birth:
-            self.birth_int = int(self.date_birth.timetuple().tm_yday)
+        self.birth_int = birth_day_of_year(self.date_birth) if self.date_birth else None
         super().save(*args, **kwargs)
 
+    def prepare_bulk(self, created):
+        self.birth_int = birth_day_of_year(self.date_birth) if self.date_birth else None
+        return super().prepare_bulk(created) + ['birth_int']
+
+    def cache_tags(self):
+        from kernel.backends import user_cache_tag
+        return super().cache_tags() + [user_cache_tag(self.pk)]
+
     @property
     def name(self):
         if self.first_name:
@@ -97,13 +108,10 @@ class KernelUser(PolymorphicModel, AbstractBaseUser, PermissionsMixin, KernelMod
 
     def send_email(self, template, context={}, **kwargs):
         from django.conf import settings
+        from kernel.mail import mail_recipients
         if self.is_emailing:
-            if settings.SEND_EMAIL:
-                send_templated_mail(template_name=template, from_email=settings.DEFAULT_FROM_EMAIL,
-                                    recipient_list=[self.email], context=context, **kwargs)
-            else:
-                send_templated_mail(template_name=template, from_email=settings.DEFAULT_FROM_EMAIL,
-                                    recipient_list=settings.DEBUG_EMAIL, context=context, **kwargs)
+            send_templated_mail(template_name=template, from_email=settings.DEFAULT_FROM_EMAIL,
+                                recipient_list=mail_recipients(self.email), context=context, **kwargs)
 
     @classmethod
     def get_admin_class(cls):
@@ -128,11 +136,13 @@ class KernelUser(PolymorphicModel, AbstractBaseUser, PermissionsMixin, KernelMod
         return 'id', 'email', 'external_id', 'last_name', 'first_name', 'middle_name', 'phone', 'date_birth', 'photo'
 
     @classmethod
-    def get_serializer_class(cls):
+    @cached_class
+    def get_serializer_class(cls, non_polymorphic=False):
         from rest_framework import serializers
         from kernel.fields import StdImageFieldSerializer
+        from kernel.constructors.serializer import model_serializer_base
 
-        class KernelUserSerializer(serializers.ModelSerializer):
+        class KernelUserSerializer(model_serializer_base(non_polymorphic)):
             get_name = serializers.CharField(source='name')
             detail_url = serializers.CharField(source='get_absolute_url')
             photo = StdImageFieldSerializer()
@@ -140,10 +150,12 @@ class KernelUser(PolymorphicModel, AbstractBaseUser, PermissionsMixin, KernelMod
             class Meta:
                 model = cls
                 fields = cls.serializer_data() + ('get_name', 'detail_url')
+                expensive_fields = ('detail_url', 'photo')
 
         return KernelUserSerializer
 
     @classmethod
+    @cached_class
     def get_filter_class(cls):
         class FilterClass(django_filters.FilterSet):
             id_list = kf.ListFilter(name='id')
@@ -163,9 +175,10 @@ class KernelUser(PolymorphicModel, AbstractBaseUser, PermissionsMixin, KernelMod
 
         class ViewSet(rv.KernelViewSets):
             queryset = cls.objects.all()
-            serializer_class = cls.get_serializer_class()
+            serializer_class = cls.get_serializer_class(cls.NON_POLYMORPHIC)
             filter_class = cls.get_filter_class()
-            list_serializer_class = cls.get_serializer_class()
+            list_serializer_class = cls.get_serializer_class(cls.NON_POLYMORPHIC)
+            non_polymorphic = cls.NON_POLYMORPHIC
 
             def get_queryset(self):
                 queryset = super(ViewSet, self).get_queryset()
@@ -3,6 +3,7 @@ from django.utils.translation import ugettext_lazy as _
 from django.utils.encoding import python_2_unicode_compatible
 # Import kernel module
 from kernel import filters as kf
+from kernel.registry import cached_class
 from .base import KernelByModel, KernelModel
 
 
@@ -17,6 +18,7 @@ class KernelUnit(KernelByModel):
     REST = True
     ADMIN = True
     ROUTE_NAME = 'unit'
+    BULK_LOOKUP = 'code'
 
     class Meta:
         abstract = True
@@ -26,12 +28,14 @@ class KernelUnit(KernelByModel):
         return self.name
 
     @classmethod
+    @cached_class
     def filter_class(cls):
         return type('{}FilterClass'.format(cls.__name__), (super().filter_class(), ), {
             'code_list':  kf.ListFilter(name='code'), 'id_list': kf.ListFilter(name='id'),
             'Meta': type('Meta', (object, ), {'model': cls, 'fields': cls.filters_data() + ('code_list', 'id_list')})})
 
     @classmethod
+    @cached_class
     def admin_class(cls):
         return type('{}Admin'.format(cls.__name__), (super().get_admin_class(), ), {
             'search_fields': ('code', 'name', )})
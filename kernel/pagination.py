@@ -0,0 +1,208 @@
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+
+import base64
+import datetime
+import hashlib
+import json
+
+
+__all__ = [
+    'InvalidCursor', 'encode_cursor', 'decode_cursor', 'estimate_count', 'count_queryset',
+    'KeysetPage', 'KeysetPaginator', 'KeysetListMixin',
+]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """ Datetimes and times at full (microsecond) precision, DjangoJSONEncoder cuts them to milliseconds """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super(CursorEncoder, self).default(o)
+
+
+def encode_cursor(values, reverse=False):
+    data = json.dumps({'v': values, 'r': int(reverse)}, cls=CursorEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        data = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        data = json.loads(data.decode('utf-8'))
+        return data['v'], bool(data['r'])
+    except (TypeError, ValueError, KeyError, UnicodeDecodeError):
+        raise InvalidCursor(cursor)
+
+
+def estimate_count(queryset):
+    """ Planner estimate of row count, PostgreSQL only, otherwise None """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def count_queryset(queryset, mode='exact', timeout=300):
+    """
+    Total rows for pagination
+        None      -- no count
+        exact     -- COUNT(*)
+        estimate  -- planner estimate (exact count on backends without EXPLAIN support)
+        cached    -- COUNT(*) cached by query for `timeout` seconds
+    """
+    if not mode:
+        return None
+    if mode == 'estimate':
+        count = estimate_count(queryset)
+        return queryset.count() if count is None else count
+    if mode == 'cached':
+        sql, params = queryset.query.sql_with_params()
+        key = 'kernel:count:{}'.format(hashlib.md5('{}{}'.format(sql, params).encode('utf-8')).hexdigest())
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, timeout)
+        return count
+    return queryset.count()
+
+
+class KeysetPage(object):
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None, count=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class KeysetPaginator(object):
+    """
+    Cursor pagination over model-declared ordering, e.g. ('created_date', 'id').
+    The last field must be unique.
+    """
+
+    def __init__(self, queryset, ordering, per_page=200, count_mode=None):
+        self.queryset = queryset
+        self.ordering = tuple(ordering)
+        self.per_page = per_page
+        self.count_mode = count_mode
+        self.model = queryset.model
+
+    @staticmethod
+    def _field_name(order):
+        return order.lstrip('-')
+
+    def _order_by(self, reverse):
+        result = []
+        for order in self.ordering:
+            descending = order.startswith('-') != reverse
+            result.append(('-' if descending else '') + self._field_name(order))
+        return result
+
+    def _values(self, obj):
+        if isinstance(obj, dict):
+            return [obj[self._field_name(o)] for o in self.ordering]
+        return [getattr(obj, self.model._meta.get_field(self._field_name(o)).attname) for o in self.ordering]
+
+    def _to_python(self, values):
+        if len(values) != len(self.ordering):
+            raise InvalidCursor(values)
+        return [self.model._meta.get_field(self._field_name(o)).to_python(v) for o, v in zip(self.ordering, values)]
+
+    def _keyset_filter(self, values, reverse):
+        """ (a, b) > (va, vb)  =>  a > va OR (a = va AND b > vb) """
+        condition = Q()
+        for index, order in enumerate(self.ordering):
+            descending = order.startswith('-') != reverse
+            lookup = Q(**{'{}__{}'.format(self._field_name(order), 'lt' if descending else 'gt'): values[index]})
+            for prev, value in zip(self.ordering[:index], values[:index]):
+                lookup &= Q(**{self._field_name(prev): value})
+            condition |= lookup
+        return condition
+
+    def page(self, cursor=None):
+        reverse = False
+        queryset = self.queryset
+        if cursor:
+            values, reverse = decode_cursor(cursor)
+            queryset = queryset.filter(self._keyset_filter(self._to_python(values), reverse))
+
+        rows = list(queryset.order_by(*self._order_by(reverse))[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if reverse:
+            rows.reverse()
+
+        next_cursor = previous_cursor = None
+        if rows:
+            if has_more or reverse:
+                next_cursor = encode_cursor(self._values(rows[-1]))
+            if cursor and (has_more or not reverse):
+                previous_cursor = encode_cursor(self._values(rows[0]), reverse=True)
+        return KeysetPage(rows, next_cursor, previous_cursor, count_queryset(self.queryset, self.count_mode))
+
+
+class KeysetListMixin(object):
+    """ Replaces OFFSET pagination of KernelList with keyset pagination """
+    cursor_query_param = 'cursor'
+    keyset_ordering = None
+    keyset_count = None
+
+    def get_keyset_page(self):
+        if not hasattr(self, '_keyset_page'):
+            queryset = super(KeysetListMixin, self).get_table_data().qs
+            paginator = KeysetPaginator(queryset, self.keyset_ordering, self.paginate_by, self.keyset_count)
+            try:
+                self._keyset_page = paginator.page(self.request.GET.get(self.cursor_query_param))
+            except InvalidCursor:
+                from django.http import Http404
+                raise Http404('Invalid cursor')
+        return self._keyset_page
+
+    def get_table_data(self):
+        return self.get_keyset_page().object_list
+
+    def get_table_pagination(self, table):
+        return False
+
+    def paginate_queryset(self, queryset, page_size):
+        return None, None, queryset, False
+
+    def get_cursor_url(self, cursor):
+        params = self.request.GET.copy()
+        params[self.cursor_query_param] = cursor
+        return '?{}'.format(params.urlencode())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        page = self.get_keyset_page()
+        context['cursor_page'] = page
+        context['next_url'] = self.get_cursor_url(page.next_cursor) if page.has_next() else None
+        context['previous_url'] = self.get_cursor_url(page.previous_cursor) if page.has_previous() else None
+        return context
@@ -0,0 +1,113 @@
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_save, post_delete
+
+from kernel import cache as kcache
+
+
+__all__ = [
+    'get_permission_set', 'has_perm', 'has_perm_bulk',
+]
+
+
+PERMISSIONS_TAG = 'auth.permissions'
+
+
+def user_permissions_tag(pk):
+    return '{}:user:{}'.format(PERMISSIONS_TAG, pk)
+
+
+_listing = {}
+
+
+def backends_list_permissions():
+    """ True if every backend answering has_perm also lists permissions (get_all_permissions) """
+    if 'value' not in _listing:
+        from django.contrib.auth import get_backends
+        _listing['value'] = all(hasattr(backend, 'get_all_permissions')
+                                for backend in get_backends() if hasattr(backend, 'has_perm'))
+    return _listing['value']
+
+
+def _load_permissions(user):
+    return frozenset(user.get_all_permissions())
+
+
+def get_permission_set(user):
+    """
+    Every permission of the user, loaded once per user object (i.e. once per request).
+    With KERNEL_PERMISSION_CACHE the set is shared across requests until groups or permissions change.
+    """
+    perms = getattr(user, '_kernel_perm_set', None)
+    if perms is None:
+        if getattr(settings, 'KERNEL_PERMISSION_CACHE', False) and user.pk:
+            perms = kcache.get_or_set(
+                'perms:{}'.format(user.pk), [PERMISSIONS_TAG, user_permissions_tag(user.pk)],
+                lambda: _load_permissions(user), getattr(settings, 'KERNEL_PERMISSION_CACHE_TIMEOUT', 3600))
+        else:
+            perms = _load_permissions(user)
+        user._kernel_perm_set = perms
+    return perms
+
+
+def has_perm(user, perm):
+    """
+    Set lookup for active users when every backend lists its permissions,
+    otherwise (anonymous / inactive users, has_perm-only backends) user.has_perm
+    """
+    if user is None:
+        return False
+    if not user.is_active or not backends_list_permissions():
+        return user.has_perm(perm)
+    if getattr(user, 'is_superuser', False):
+        return True
+    return perm in get_permission_set(user)
+
+
+def has_perm_bulk(user, perm, objects):
+    """
+    {obj.pk: bool} for a list of objects: the model permission (one set lookup) covers
+    every object, otherwise object permissions are checked for each object
+    """
+    if has_perm(user, perm):
+        return {obj.pk: True for obj in objects}
+    if user is None:
+        return {obj.pk: False for obj in objects}
+    return {obj.pk: user.has_perm(perm, obj) for obj in objects}
+
+
+def _groups_changed(sender, **kwargs):
+    kcache.bump_tags(PERMISSIONS_TAG)
+
+
+def _m2m_changed(sender, instance, action, pk_set=None, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    user_model = get_user_model()
+    if sender in (user_model.groups.through, user_model.user_permissions.through):
+        if isinstance(instance, user_model):
+            kcache.bump_tags(user_permissions_tag(instance.pk))
+        elif pk_set:
+            kcache.bump_tags(*[user_permissions_tag(pk) for pk in pk_set])
+        else:
+            kcache.bump_tags(PERMISSIONS_TAG)
+    elif sender is apps.get_model('auth', 'Group').permissions.through:
+        kcache.bump_tags(PERMISSIONS_TAG)
+
+
+def _setting_changed(setting, **kwargs):
+    if setting == 'AUTHENTICATION_BACKENDS':
+        _listing.clear()
+
+
+try:
+    from django.test.signals import setting_changed
+    setting_changed.connect(_setting_changed, dispatch_uid='kernel_permissions_backends')
+except ImportError:
+    pass
+
+m2m_changed.connect(_m2m_changed, dispatch_uid='kernel_permissions_m2m')
+for _sender in ('auth.Group', 'auth.Permission'):
+    post_save.connect(_groups_changed, sender=_sender, dispatch_uid='kernel_permissions_save')
+    post_delete.connect(_groups_changed, sender=_sender, dispatch_uid='kernel_permissions_delete')
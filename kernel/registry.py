@@ -0,0 +1,105 @@
+from functools import wraps
+
+import threading
+
+
+__all__ = [
+    'ClassRegistry', 'registry', 'cached_class',
+]
+
+
+class ClassRegistry(object):
+    """
+    Process-wide storage for classes generated by model factories
+    (serializers, filters, forms, admin, views).
+
+    Key: (model, factory, parameters)
+    """
+    _empty = object()
+
+    def __init__(self):
+        self._classes = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_create(self, key, factory):
+        obj = self._classes.get(key, self._empty)
+        if obj is not self._empty:
+            self.hits += 1
+            return obj
+        with self._lock:
+            obj = self._classes.get(key, self._empty)
+            if obj is self._empty:
+                self.misses += 1
+                obj = self._classes[key] = factory()
+            else:
+                self.hits += 1
+        return obj
+
+    def invalidate(self, model=None, factory=None):
+        """ Drop generated classes, all of them or only for given model / factory name """
+        with self._lock:
+            for key in list(self._classes):
+                if model is not None and key[0] is not model:
+                    continue
+                if factory is not None and key[1].rsplit('.', 1)[-1] != factory:
+                    continue
+                del self._classes[key]
+
+    def clear(self):
+        with self._lock:
+            self._classes.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._classes)}
+
+
+registry = ClassRegistry()
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def cached_class(func):
+    """
+    Memoize a class factory whose first argument is the model.
+
+        @classmethod
+        @cached_class
+        def filter_class(cls):
+            ...
+    """
+    name = func.__qualname__
+
+    @wraps(func)
+    def wrapper(model, *args, **kwargs):
+        from django.conf import settings
+        if not getattr(settings, 'KERNEL_CLASS_REGISTRY', True):
+            return func(model, *args, **kwargs)
+        try:
+            key = (model, name, _freeze(args), _freeze(kwargs))
+            hash(key)
+        except TypeError:
+            return func(model, *args, **kwargs)
+        return registry.get_or_create(key, lambda: func(model, *args, **kwargs))
+    return wrapper
+
+
+def _setting_changed(setting, **kwargs):
+    if setting in ('KERNEL_CLASS_REGISTRY', 'INSTALLED_APPS'):
+        registry.clear()
+
+
+try:
+    from django.test.signals import setting_changed
+    setting_changed.connect(_setting_changed, dispatch_uid='kernel_class_registry')
+except ImportError:
+    pass
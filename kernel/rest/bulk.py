@@ -0,0 +1,228 @@
+from django.db import transaction, DatabaseError
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.decorators import list_route
+from rest_framework.exceptions import ParseError, PermissionDenied
+from rest_framework.response import Response
+
+from kernel.db import bulk_update
+
+
+class BulkModelMixin(object):
+    """
+    Bulk endpoints, every item is validated with the write serializer, rows are written
+    with bulk_create / bulk_update in transactional batches. Object permissions are checked
+    for every existing row, rows matched by bulk-upsert need the change permission.
+    save() is not called, the model prepare_bulk() fills what it would (slug, polymorphic type):
+
+        POST   bulk-create/   [{...}, ...]
+        POST   bulk-upsert/   [{...}, ...]   matched by model BULK_LOOKUP (external_id, code)
+        PATCH  bulk-update/   [{"id": 1, ...}, ...]
+        DELETE bulk-delete/   [1, 2, ...]
+
+    Response is a list of per-item results in the order of the request.
+    """
+    bulk_batch_size = 500
+
+    def get_bulk_items(self, request):
+        items = request.data
+        if isinstance(items, dict):
+            items = items.get('items', items.get('ids'))
+        if not isinstance(items, list):
+            raise ParseError('Expected a list of items')
+        return items
+
+    def get_bulk_serializer(self, *args, **kwargs):
+        kwargs.setdefault('context', self.get_serializer_context())
+        return self.serializer_class(*args, **kwargs)
+
+    def get_bulk_lookup(self):
+        return getattr(self.queryset.model, 'BULK_LOOKUP', 'external_id')
+
+    def stamp_bulk_object(self, obj, created):
+        user = self.request.user if getattr(self.request.user, 'pk', None) else None
+        field_names = [f.name for f in obj._meta.concrete_fields]
+        if created and 'created_by' in field_names and not obj.created_by_id:
+            obj.created_by = user
+        if 'modified_by' in field_names:
+            obj.modified_by = user
+        if not created and 'modified_date' in field_names:
+            obj.modified_date = timezone.now()
+
+    def prepare_bulk_object(self, obj, created):
+        """ Names of the fields filled by the model prepare_bulk() """
+        prepare = getattr(obj, 'prepare_bulk', None)
+        return prepare(created) if prepare is not None else []
+
+    def check_bulk_change_permission(self, request):
+        """ Rows matched by bulk-upsert are changed: model permissions are checked as for PUT """
+        model = self.queryset.model
+        for permission in self.get_permissions():
+            required = getattr(permission, 'get_required_permissions', None)
+            if required is not None and not request.user.has_perms(required('PUT', model)):
+                self.permission_denied(request, message=getattr(permission, 'message', None))
+
+    def has_bulk_object_permission(self, request, obj, method=None):
+        """ check_object_permissions for one row, `method` overrides the request method of mapped permissions """
+        for permission in self.get_permissions():
+            required = getattr(permission, 'get_required_object_permissions', None)
+            if method is not None and required is not None:
+                allowed = request.user.has_perms(required(method, obj.__class__), obj)
+            else:
+                allowed = permission.has_object_permission(request, self, obj)
+            if not allowed:
+                return False
+        return True
+
+    def _denied(self, results, index):
+        results[index] = {'index': index, 'status': 'error', 'errors': [str(PermissionDenied.default_detail)]}
+
+    @staticmethod
+    def _plain_data(model, validated_data):
+        m2m = {f.name for f in model._meta.many_to_many}
+        return {key: value for key, value in validated_data.items() if key not in m2m}
+
+    def _batches(self, items):
+        for i in range(0, len(items), self.bulk_batch_size):
+            yield items[i:i + self.bulk_batch_size]
+
+    def _write(self, results, objects, writer, status_name):
+        for batch in self._batches(objects):
+            try:
+                with transaction.atomic():
+                    writer([obj for index, obj in batch])
+            except DatabaseError as e:
+                for index, obj in batch:
+                    results[index] = {'index': index, 'status': 'error', 'errors': [str(e)]}
+            else:
+                for index, obj in batch:
+                    results[index] = {'index': index, 'status': status_name, 'id': obj.pk}
+
+    def _invalidate(self, objects):
+        model = self.queryset.model
+        if getattr(model, 'CACHE_TAGS', False):
+            model.invalidate_bulk_cache(objects)
+
+    def _bulk_save(self, request, upsert=False):
+        model = self.queryset.model
+        items = self.get_bulk_items(request)
+        results = [None] * len(items)
+        lookup = self.get_bulk_lookup()
+
+        existing = {}
+        if upsert:
+            existing = model.in_bulk_by(lookup, [item.get(lookup) for item in items if isinstance(item, dict)],
+                                        self.bulk_batch_size)
+            if existing:
+                self.check_bulk_change_permission(request)
+
+        created, updated, update_fields, seen = [], [], set(), set()
+        for index, item in enumerate(items):
+            key = item.get(lookup) if upsert and isinstance(item, dict) else None
+            if key not in (None, ''):
+                if str(key) in seen:
+                    results[index] = {'index': index, 'status': 'error',
+                                      'errors': ['Duplicate {} in the request'.format(lookup)]}
+                    continue
+                seen.add(str(key))
+            instance = existing.get(str(key)) if key not in (None, '') else None
+            if instance is not None and not self.has_bulk_object_permission(request, instance, 'PUT'):
+                self._denied(results, index)
+                continue
+            serializer = self.get_bulk_serializer(instance, data=item)
+            if not serializer.is_valid():
+                results[index] = {'index': index, 'status': 'error', 'errors': serializer.errors}
+                continue
+            data = self._plain_data(model, serializer.validated_data)
+            if instance is None:
+                if key not in (None, '') and lookup not in data:
+                    data[lookup] = key
+                obj = model(**data)
+                self.stamp_bulk_object(obj, True)
+                self.prepare_bulk_object(obj, True)
+                created.append((index, obj))
+            else:
+                for name, value in data.items():
+                    setattr(instance, name, value)
+                self.stamp_bulk_object(instance, False)
+                update_fields.update(data)
+                update_fields.update(self.prepare_bulk_object(instance, False))
+                updated.append((index, instance))
+
+        self._write(results, created, lambda objs: model._default_manager.bulk_create(objs), 'created')
+        if updated:
+            update_fields.update(f for f in ('modified_by', 'modified_date') if hasattr(model, f))
+            self._write(results, updated, lambda objs: bulk_update(model._default_manager, objs, update_fields),
+                        'updated')
+        self._invalidate([obj for index, obj in created + updated])
+        return Response(results, status=status.HTTP_200_OK)
+
+    @list_route(methods=['post'], url_path='bulk-create')
+    def bulk_create(self, request, *args, **kwargs):
+        return self._bulk_save(request)
+
+    @list_route(methods=['post'], url_path='bulk-upsert')
+    def bulk_upsert(self, request, *args, **kwargs):
+        return self._bulk_save(request, upsert=True)
+
+    @list_route(methods=['patch'], url_path='bulk-update')
+    def bulk_update(self, request, *args, **kwargs):
+        model = self.queryset.model
+        items = self.get_bulk_items(request)
+        results = [None] * len(items)
+        ids = [item.get('id') for item in items if isinstance(item, dict) and item.get('id') is not None]
+        instances = {}
+        for batch in self._batches(ids):
+            instances.update(self.get_queryset().in_bulk(batch))
+
+        updated, update_fields = [], set()
+        for index, item in enumerate(items):
+            instance = instances.get(item.get('id')) if isinstance(item, dict) else None
+            if instance is None:
+                results[index] = {'index': index, 'status': 'error', 'errors': ['Not found']}
+                continue
+            if not self.has_bulk_object_permission(request, instance):
+                self._denied(results, index)
+                continue
+            serializer = self.get_bulk_serializer(instance, data=item, partial=True)
+            if not serializer.is_valid():
+                results[index] = {'index': index, 'status': 'error', 'errors': serializer.errors}
+                continue
+            data = self._plain_data(model, serializer.validated_data)
+            for key, value in data.items():
+                setattr(instance, key, value)
+            self.stamp_bulk_object(instance, False)
+            update_fields.update(data)
+            update_fields.update(self.prepare_bulk_object(instance, False))
+            updated.append((index, instance))
+
+        if updated:
+            update_fields.update(f for f in ('modified_by', 'modified_date') if hasattr(model, f))
+            self._write(results, updated, lambda objs: bulk_update(model._default_manager, objs, update_fields),
+                        'updated')
+            self._invalidate([obj for index, obj in updated])
+        return Response(results, status=status.HTTP_200_OK)
+
+    @list_route(methods=['delete'], url_path='bulk-delete')
+    def bulk_delete(self, request, *args, **kwargs):
+        items = self.get_bulk_items(request)
+        results = [None] * len(items)
+        instances = {}
+        for batch in self._batches(items):
+            instances.update(self.get_queryset().in_bulk(batch))
+
+        found = []
+        for index, pk in enumerate(items):
+            if pk not in instances:
+                results[index] = {'index': index, 'status': 'error', 'errors': ['Not found']}
+            elif not self.has_bulk_object_permission(request, instances[pk]):
+                self._denied(results, index)
+            else:
+                found.append((index, instances[pk]))
+
+        def delete(objs):
+            self.queryset.model._default_manager.filter(pk__in=[obj.pk for obj in objs]).delete()
+        self._write(results, found, delete, 'deleted')
+        self._invalidate([obj for index, obj in found])
+        return Response(results, status=status.HTTP_200_OK)
@@ -0,0 +1,39 @@
+from collections import OrderedDict
+
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from kernel.pagination import KeysetPaginator, InvalidCursor
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset pagination driven by KernelModel.KEYSET_ORDERING, count by KernelModel.KEYSET_COUNT
+    """
+    cursor_query_param = 'cursor'
+    page_size = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        model = queryset.model
+        paginator = KeysetPaginator(queryset, model.KEYSET_ORDERING, self.page_size, getattr(model, 'KEYSET_COUNT', None))
+        self.request = request
+        try:
+            self.page = paginator.page(request.query_params.get(self.cursor_query_param))
+        except InvalidCursor:
+            raise NotFound('Invalid cursor')
+        return self.page.object_list
+
+    def get_cursor_link(self, cursor):
+        if cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('count', self.page.count),
+            ('next', self.get_cursor_link(self.page.next_cursor)),
+            ('previous', self.get_cursor_link(self.page.previous_cursor)),
+            ('results', data),
+        ]))
@@ -0,0 +1,66 @@
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+__all__ = [
+    'FastJSONRenderer', 'MessagePackRenderer', 'get_renderer_classes',
+]
+
+
+_encoder = JSONEncoder()
+
+
+def _default(obj):
+    """ Types encoded the way JSONRenderer does: dates, Decimal, UUID, lazy strings """
+    return _encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON with orjson, the output of JSONRenderer for compact UTF-8 JSON (dates and Decimal
+    go through the DRF encoder, U+2028 / U+2029 are escaped) except NaN / Infinity, written as null.
+    Falls back to JSONRenderer when orjson is not installed, for indented output and
+    for COMPACT_JSON / UNICODE_JSON / STRICT_JSON = False.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact or \
+                not getattr(self, 'strict', True) or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super(FastJSONRenderer, self).render(data, accepted_media_type, renderer_context)
+        ret = orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_default, use_bin_type=True)
+
+
+def get_renderer_classes():
+    """
+    DEFAULT_RENDERER_CLASSES with JSONRenderer replaced by FastJSONRenderer and MessagePackRenderer
+    added (if msgpack is installed), for viewsets with fast_renderers = True
+    """
+    classes = list(api_settings.DEFAULT_RENDERER_CLASSES)
+    classes = [FastJSONRenderer if cls is JSONRenderer else cls for cls in classes]
+    if msgpack is not None:
+        classes.append(MessagePackRenderer)
+    return classes
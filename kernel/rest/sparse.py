@@ -0,0 +1,92 @@
+from django.db import models
+
+from rest_framework import serializers
+
+from kernel.registry import cached_class
+
+
+__all__ = [
+    'field_names', 'expensive_fields', 'sparse_serializer', 'sparse_columns', 'plain_fields', 'coerced_fields',
+]
+
+
+# Serializer fields rendering a column value as it is (CharField covers email, slug, url),
+# the values() fast path skips their to_representation
+IDENTITY_FIELDS = (serializers.CharField, serializers.IntegerField, serializers.BooleanField,
+                   serializers.NullBooleanField)
+
+
+@cached_class
+def field_names(serializer_class):
+    """ Declared field names of a serializer, the only valid ?fields= / ?exclude= values """
+    return frozenset(serializer_class().fields)
+
+
+def expensive_fields(serializer_class):
+    """ Meta.expensive_fields of a serializer, skipped unless requested """
+    return tuple(getattr(getattr(serializer_class, 'Meta', None), 'expensive_fields', ()))
+
+
+@cached_class
+def sparse_serializer(serializer_class, fields=None, exclude=None, skip_expensive=False):
+    """
+    Serializer narrowed to `fields` / without `exclude` (cached per arguments: pass only
+    names from field_names(), never raw client input).
+    Fields listed in Meta.expensive_fields (computed urls, image variations) are dropped
+    with skip_expensive unless explicitly requested.
+    """
+    expensive = expensive_fields(serializer_class)
+    names = []
+    for name in serializer_class().fields:
+        if fields and name not in fields:
+            continue
+        if exclude and name in exclude:
+            continue
+        if skip_expensive and name in expensive and not (fields and name in fields):
+            continue
+        names.append(name)
+
+    class Meta(serializer_class.Meta):
+        pass
+    Meta.fields = tuple(names)
+    Meta.exclude = None
+    return type('Sparse{}'.format(serializer_class.__name__), (serializer_class, ), {'Meta': Meta})
+
+
+@cached_class
+def sparse_columns(serializer_class, model):
+    """ Columns for queryset.only(), None if a serializer field needs something else than a plain column """
+    concrete = {f.name for f in model._meta.concrete_fields}
+    columns = {model._meta.pk.name}
+    if 'polymorphic_ctype' in concrete:
+        columns.add('polymorphic_ctype')
+    for field in serializer_class().fields.values():
+        if field.source not in concrete:
+            return None
+        columns.add(field.source)
+    return tuple(sorted(columns))
+
+
+@cached_class
+def plain_fields(serializer_class, model):
+    """
+    Field names for queryset.values() if every serializer field is a plain column under its own name
+    (no computed, nested or file fields), otherwise None
+    """
+    concrete = {f.name: f for f in model._meta.concrete_fields}
+    names = []
+    for name, field in serializer_class().fields.items():
+        model_field = concrete.get(field.source)
+        if field.source != name or model_field is None or isinstance(model_field, models.FileField):
+            return None
+        names.append(name)
+    return tuple(names)
+
+
+@cached_class
+def coerced_fields(serializer_class):
+    """
+    Names of fields whose output differs from the column value (decimals, dates, choices, uuids):
+    values() rows are passed through their to_representation
+    """
+    return tuple(name for name, field in serializer_class().fields.items() if not isinstance(field, IDENTITY_FIELDS))
@@ -3,6 +3,13 @@ from rest_framework.filters import OrderingFilter, SearchFilter, DjangoFilterBac
 from rest_framework.permissions import DjangoModelPermissions, DjangoObjectPermissions
 from rest_framework.settings import api_settings
 from rest_framework.response import Response
+from rest_framework.decorators import list_route
+from django.shortcuts import get_object_or_404
+
+from kernel.rest.bulk import BulkModelMixin
+from kernel import conditional
+from kernel.rest import sparse
+from kernel.rest import renderers
 
 
 
@@ -10,6 +17,10 @@ class BaseViewSets(object):
     list_serializer_class = False
     retrieve_serializer_class = False
     to_filter_backends = False
+    non_polymorphic = False
+    skip_expensive_fields = True
+    fast_values = False
+    fast_renderers = False
 
     @property
     def filter_backends(self):
@@ -18,7 +29,54 @@ class BaseViewSets(object):
                 return api_settings.DEFAULT_FILTER_BACKENDS + self.to_filter_backends
         return api_settings.DEFAULT_FILTER_BACKENDS
 
+    @property
+    def renderer_classes(self):
+        if self.fast_renderers:
+            return renderers.get_renderer_classes()
+        return api_settings.DEFAULT_RENDERER_CLASSES
+
+    @property
+    def pagination_class(self):
+        if getattr(getattr(self.queryset, 'model', None), 'KEYSET_ORDERING', None):
+            from kernel.rest.pagination import KeysetPagination
+            return KeysetPagination
+        return api_settings.DEFAULT_PAGINATION_CLASS
+
+    def get_queryset(self):
+        queryset = super(BaseViewSets, self).get_queryset()
+        if self.non_polymorphic and hasattr(queryset, 'non_polymorphic'):
+            queryset = queryset.non_polymorphic()
+        fields, exclude, skip_expensive = self.get_sparse_fields()
+        if self.request.method == 'GET' and (fields or exclude or skip_expensive):
+            columns = sparse.sparse_columns(self.get_serializer_class(), queryset.model)
+            if columns:
+                queryset = queryset.only(*columns)
+        return queryset
+
+    def get_sparse_fields(self):
+        """
+        ?fields=a,b / ?exclude=c from the query string, unknown names are ignored;
+        Meta.expensive_fields are skipped if the serializer declares any
+        """
+        serializer_class = self.get_base_serializer_class()
+        names = sparse.field_names(serializer_class)
+        fields, exclude = [
+            tuple(sorted(names.intersection(self.request.query_params.get(param, '').split(',')))) or None
+            for param in ('fields', 'exclude')
+        ]
+        skip_expensive = self.skip_expensive_fields and bool(sparse.expensive_fields(serializer_class))
+        return fields, exclude, skip_expensive
+
     def get_serializer_class(self):
+        serializer_class = self.get_base_serializer_class()
+        if self.request.method != 'GET':
+            return serializer_class
+        fields, exclude, skip_expensive = self.get_sparse_fields()
+        if fields or exclude or skip_expensive:
+            return sparse.sparse_serializer(serializer_class, fields, exclude, skip_expensive)
+        return serializer_class
+
+    def get_base_serializer_class(self):
         if hasattr(self, 'list_serializer_class') or hasattr(self, 'serializer_class_list'):
             if self.list_serializer_class:
                 if self.request.method == 'PUT':
@@ -28,15 +86,77 @@ class BaseViewSets(object):
                 return self.list_serializer_class
         return self.serializer_class
 
-    def list(self, request, *args, **kwargs):
-        list = super(BaseViewSets, self).list(request, *args, **kwargs)
-        return list
-
+    def is_conditional(self):
+        return getattr(getattr(self.queryset, 'model', None), 'CONDITIONAL_GET', False)
 
-class KernelViewSets(BaseViewSets, viewsets.ModelViewSet):
+    def get_conditional_parts(self, obj):
+        """ Extra ETag parts of retrieve(), what else the serializer renders (e.g. related modified dates) """
+        return ()
 
-    def retrieve(self, *args, **kwargs):
+    def list(self, request, *args, **kwargs):
+        if not self.is_conditional():
+            return self.list_response(request, *args, **kwargs)
+        etag, last_modified = conditional.queryset_validators(
+            self.filter_queryset(self.get_queryset()), request,
+            count=not getattr(self.queryset.model, 'KEYSET_ORDERING', None))
+        response = conditional.conditional_response(request, etag, last_modified)
+        if response is not None:
+            return response
+        list = self.list_response(request, *args, **kwargs)
+        return conditional.set_validators(list, etag, last_modified)
+
+    def get_values_fields(self):
+        """ Fields for the values() fast path, None if the serializer needs model instances """
+        if not self.fast_values:
+            return None
+        model = self.queryset.model
+        fields = sparse.plain_fields(self.get_serializer_class(), model)
+        ordering = [o.lstrip('-') for o in (getattr(model, 'KEYSET_ORDERING', None) or ())]
+        if fields is None or not set(ordering).issubset(fields):
+            return None
+        return fields
+
+    def list_response(self, request, *args, **kwargs):
+        fields = self.get_values_fields()
+        if fields is None:
+            return super(BaseViewSets, self).list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset()).values(*fields)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.coerce_values(list(page)))
+        return Response(self.coerce_values(list(queryset)))
+
+    def coerce_values(self, rows):
+        """ values() rows rendered as the serializer does: to_representation of non-plain fields (decimals, dates) """
+        serializer_class = self.get_serializer_class()
+        names = sparse.coerced_fields(serializer_class)
+        if not names:
+            return rows
+        fields = serializer_class(context=self.get_serializer_context()).fields
+        converters = [(name, fields[name].to_representation) for name in names]
+        for row in rows:
+            for name, to_representation in converters:
+                if row[name] is not None:
+                    row[name] = to_representation(row[name])
+        return rows
+
+    @list_route(url_path=r'external/(?P<external_id>[^/]+)')
+    def by_external_id(self, request, external_id=None, *args, **kwargs):
+        instance = get_object_or_404(self.get_queryset(), external_id=external_id)
+        self.check_object_permissions(request, instance)
+        return Response(self.get_serializer(instance).data)
+
+
+class KernelViewSets(BulkModelMixin, BaseViewSets, viewsets.ModelViewSet):
+
+    def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
+        if self.is_conditional():
+            etag, last_modified = conditional.object_validators(instance, request,
+                                                                *self.get_conditional_parts(instance))
+            response = conditional.conditional_response(request, etag, last_modified)
+            if response is not None:
+                return response
         if hasattr(self, 'retrieve_serializer_class'):
             if hasattr(self, 'serializer_class_retrieve'):
                 serializer = self.serializer_class_retrieve(instance)
@@ -44,6 +164,8 @@ class KernelViewSets(BaseViewSets, viewsets.ModelViewSet):
                 serializer = self.get_serializer(instance)
         else:
             serializer = self.get_serializer(instance)
+        if self.is_conditional():
+            return conditional.set_validators(Response(serializer.data), etag, last_modified)
         return Response(serializer.data)
 
 
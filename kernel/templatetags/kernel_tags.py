@@ -1,20 +1,70 @@
 from django import template
-from django.core.urlresolvers import reverse, NoReverseMatch
+from django.core.urlresolvers import reverse, resolve, NoReverseMatch, Resolver404, get_script_prefix, get_urlconf
+
+from functools import lru_cache
 
 import re
 
 register = template.Library()
 
 
-@register.simple_tag(takes_context=True)
-def active(context, pattern_or_urlname):
-    print(pattern_or_urlname)
+@lru_cache(maxsize=1024)
+def _compile(pattern_or_urlname, urlconf=None, prefix=None):
+    """
+    Compiled regex of an url name (reversed, matches the path prefix) or of a raw pattern,
+    urlconf and script prefix are part of the cache key
+    """
     try:
-        pattern = '^' + reverse(pattern_or_urlname)
+        return re.compile('^' + re.escape(reverse(pattern_or_urlname, urlconf=urlconf)))
     except NoReverseMatch:
-        pattern = pattern_or_urlname
-    print(pattern )
-    path = context['request'].path
-    if re.search(pattern, path):
+        return re.compile(pattern_or_urlname)
+
+
+def _resolver_match(request):
+    """ ResolverMatch of the current path, resolved at most once per request """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        match = getattr(request, '_kernel_resolver_match', None)
+        if match is None:
+            try:
+                match = resolve(request.path_info, getattr(request, 'urlconf', None))
+            except Resolver404:
+                match = False
+            request._kernel_resolver_match = match
+    return match or None
+
+
+@register.simple_tag(takes_context=True)
+def active(context, pattern_or_urlname):
+    pattern = _compile(pattern_or_urlname, get_urlconf(), get_script_prefix())
+    if pattern.search(context['request'].path):
         return 'active'
-    return ''
\ No newline at end of file
+    return ''
+
+
+@register.simple_tag(takes_context=True)
+def active_view(context, *names):
+    """
+    'active' if the current view is one of the url names, without reverse():
+    {% active_view 'kernel:login' 'kernel:signup' %}, a name ending with ':' matches the whole namespace.
+    Names are compared with the namespaced view name, 'login' does not match 'admin:login'
+    """
+    match = _resolver_match(context['request'])
+    if match is None:
+        return ''
+    for name in names:
+        if name == match.view_name or (name.endswith(':') and match.view_name.startswith(name)):
+            return 'active'
+    return ''
+
+
+def _setting_changed(setting, **kwargs):
+    if setting in ('ROOT_URLCONF', 'FORCE_SCRIPT_NAME'):
+        _compile.cache_clear()
+
+
+try:
+    from django.test.signals import setting_changed
+    setting_changed.connect(_setting_changed, dispatch_uid='kernel_tags_compile')
+except ImportError:
+    pass
@@ -1,10 +1,14 @@
 from django import template
 
+from kernel import permissions as kperm
+
 register = template.Library()
 
 
 @register.filter
-def permission(user, permission, obj):
+def permission(user, permission, obj=None):
+    if obj is None:
+        return kperm.has_perm(user, permission)
     if user.has_perm(permission, obj):
         return True
     return False
@@ -9,7 +9,11 @@ from django.views.generic import ListView
 
 from django_tables2.views import SingleTableMixin
 from django_filters.views import BaseFilterView
-from urllib import parse
+
+from kernel.registry import cached_class
+from kernel.pagination import KeysetListMixin
+from kernel.conditional import ConditionalListMixin, ConditionalDetailMixin
+from kernel.columns import ColumnPreferenceMixin, table_columns
 
 
 import itertools
@@ -42,6 +46,7 @@ class KernelBaseMixin(object):
 class KernelViewSetMixin(KernelBaseMixin):
 
     @staticmethod
+    @cached_class
     def create_class_form(_cls, _form_class=False, _form_valid_message='', _parents=[], **_kwargs):
         parents = list(itertools.chain([KernelDispachMixin, CreateView, ], _parents))
 
@@ -69,6 +74,7 @@ class KernelViewSetMixin(KernelBaseMixin):
         return Create
 
     @staticmethod
+    @cached_class
     def update_class_form(_cls, _form_class=False, _form_valid_message='', _parents=[], **_kwargs):
         _form_class = _form_class if _form_class else _cls.get_modelform_class()
         parents = list(itertools.chain([KernelDispachMixin, UpdateView, ], _parents))
@@ -104,9 +110,11 @@ class KernelViewSetMixin(KernelBaseMixin):
         return Update
 
     @staticmethod
+    @cached_class
     def list_class(_cls, _parents=None, _context={}, **_kwargs):
         parents = list(itertools.chain(
-            [] if _parents is None else _parents, [KernelDispachMixin, BaseFilterView, SingleTableMixin, ListView])
+            [] if _parents is None else _parents, [ConditionalListMixin] if _cls.CONDITIONAL_GET else [],
+            [ColumnPreferenceMixin, KernelDispachMixin, BaseFilterView, SingleTableMixin, ListView])
         )
 
         class KernelList(*parents):
@@ -124,27 +132,48 @@ class KernelViewSetMixin(KernelBaseMixin):
             def get_filterset_class(self):
                 return _cls.filter_class()
 
+            def get_filterset_data(self):
+                """ Filters from query string, and from body for lists too long for a URL (id_list, code_list) """
+                if self.request.method == 'POST':
+                    data = self.request.GET.copy()
+                    data.update(self.request.POST)
+                    return data
+                return self.request.GET
+
+            def get_filterset_kwargs(self, filterset_class):
+                kwargs = super().get_filterset_kwargs(filterset_class)
+                kwargs['data'] = self.get_filterset_data() or None
+                return kwargs
+
+            def post(self, request, *args, **kwargs):
+                return self.get(request, *args, **kwargs)
+
             def get_table_data(self):
-                return self.get_filterset_class()(self.request.GET, queryset=self.get_queryset())
+                return self.get_filterset_class()(self.get_filterset_data(), queryset=self.get_queryset())
 
             def get_context_data(self, **kwargs):
                 context = super().get_context_data(**kwargs)
                 table = self.get_table()
-                table.hide_fields = ['', ]
+                table.hide_fields = self.get_hidden_columns()
+                table.all_columns = table_columns(self.get_table_class())
                 table.requests = self.request.GET
-                table_cookie = self.request.COOKIES.get(str(self.request.path).replace('/', ''))
-                if table_cookie:
-                    table.hide_fields = eval(parse.unquote(table_cookie))
                 context[self.get_context_table_name(table)] = table
                 context['status'] = self.kwargs.get('status', False)
                 context['model'] = _cls._meta.verbose_name
                 list(map(lambda item: context.setdefault(item[0], item[1](self) if callable(item[1]) else item[1]), _context.items()))
                 return context
+
+        if _cls.KEYSET_ORDERING:
+            return type('KernelList', (KeysetListMixin, KernelList), {
+                'keyset_ordering': _cls.KEYSET_ORDERING, 'keyset_count': _cls.KEYSET_COUNT})
         return KernelList
 
     @staticmethod
+    @cached_class
     def detail_class(_cls, _parents=[], _context={}, **_kwargs):
-        parents = list(itertools.chain([] if _parents is None else _parents, [KernelDispachMixin, DetailView]))
+        parents = list(itertools.chain([] if _parents is None else _parents,
+                                       [ConditionalDetailMixin] if _cls.CONDITIONAL_GET else [],
+                                       [KernelDispachMixin, DetailView]))
 
         class KernelDetail(*parents):
             model = _cls
@@ -2,11 +2,13 @@ from django.views.generic import DetailView, UpdateView
 
 from kernel.views.kernel import KernelViewSetMixin, KernelDispachMixin
 from kernel import forms as kf
+from kernel.registry import cached_class
 
 
 class KernelUserUpdateMixin(object):
 
     @staticmethod
+    @cached_class
     def update_form_class(_cls, _form_class=None, _list_field=None):
         _cls_update_form = KernelViewSetMixin.update_class_form(_cls)
 
@@ -0,0 +1,35 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+import multiprocessing
+import os
+import sys
+
+
+__all__ = [
+    'setup_worker', 'process_pool',
+]
+
+
+def setup_worker(settings_module=None):
+    """ Pool process initializer: spawn / forkserver workers start without a configured Django """
+    if settings_module:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def process_pool(workers=None):
+    """
+    ProcessPoolExecutor whose workers run django.setup() before their first task.
+    KERNEL_WORKER_START_METHOD picks fork / spawn / forkserver (default: the platform's).
+    Python < 3.7 has no pool initializer, its pools always fork.
+    """
+    if sys.version_info < (3, 7):
+        return ProcessPoolExecutor(workers)
+    context = multiprocessing.get_context(getattr(settings, 'KERNEL_WORKER_START_METHOD', None))
+    return ProcessPoolExecutor(workers, mp_context=context, initializer=setup_worker,
+                               initargs=(os.environ.get('DJANGO_SETTINGS_MODULE'), ))
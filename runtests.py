@@ -0,0 +1,19 @@
+#!/usr/bin/env python
+import os
+import sys
+
+import django
+from django.conf import settings
+
+
+def runtests(*labels):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'tests.settings')
+    django.setup()
+    from django.test.utils import get_runner
+    runner = get_runner(settings)()
+    failures = runner.run_tests(labels or ['tests'])
+    sys.exit(bool(failures))
+
+
+if __name__ == '__main__':
+    runtests(*sys.argv[1:])
@@ -0,0 +1,21 @@
+class HasPermOnlyBackend(object):
+    """ Grants tests.change_document to everyone, anonymous and inactive users included """
+
+    def authenticate(self, *args, **kwargs):
+        return None
+
+    def has_perm(self, user, perm, obj=None):
+        return perm == 'tests.change_document'
+
+
+class EvenObjectBackend(object):
+    """ Object permission on documents with an even pk """
+
+    def authenticate(self, *args, **kwargs):
+        return None
+
+    def get_all_permissions(self, user, obj=None):
+        return set()
+
+    def has_perm(self, user, perm, obj=None):
+        return obj is not None and perm == 'tests.change_document' and obj.pk % 2 == 0
@@ -0,0 +1,40 @@
+from django.db import models
+
+from kernel.models import KernelByModel, KernelModel, KernelPage
+
+
+class Category(KernelModel):
+    name = models.CharField(max_length=100)
+
+
+class Document(KernelByModel):
+    title = models.CharField(max_length=100)
+    body = models.TextField(blank=True)
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, null=True, blank=True)
+    views = models.IntegerField(default=0)
+    price = models.DecimalField(max_digits=8, decimal_places=2, default=0)
+
+    KEYSET_ORDERING = ('created_date', 'id')
+
+    class Meta:
+        ordering = ('id', )
+
+
+class Note(KernelModel):
+    text = models.CharField(max_length=100)
+
+    CONDITIONAL_GET = True
+    KEYSET_ORDERING = ('created_date', 'id')
+
+
+class Article(KernelPage):
+    pass
+
+
+class Missing(models.Model):
+    """ Model without a table, writes fail with a database error """
+    views = models.IntegerField(default=0)
+
+    class Meta:
+        managed = False
+        db_table = 'tests_missing_table'
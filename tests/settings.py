@@ -0,0 +1,41 @@
+import os
+
+
+SECRET_KEY = 'kernel-tests'
+DEBUG = False
+DATABASES = {'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}}
+INSTALLED_APPS = [
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.admin',
+    'polymorphic',
+    'rest_framework',
+    'kernel',
+    'tests',
+]
+MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'kernel.middleware.CrequestMiddleware',
+]
+AUTH_USER_MODEL = 'kernel.KernelUser'
+ROOT_URLCONF = 'tests.urls'
+TEMPLATES = [{
+    'BACKEND': 'django.template.backends.django.DjangoTemplates',
+    'DIRS': [os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')],
+    'APP_DIRS': True,
+    'OPTIONS': {'context_processors': [
+        'django.template.context_processors.request',
+        'django.contrib.auth.context_processors.auth',
+        'django.contrib.messages.context_processors.messages',
+    ]},
+}]
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+DEFAULT_FROM_EMAIL = 'kernel@example.com'
+SEND_EMAIL = True
+DEBUG_EMAIL = ['debug@example.com']
+USE_TZ = True
+MY_APPS = []
@@ -0,0 +1,40 @@
+from django.contrib import admin
+from django.contrib.auth.models import Group
+from django.test import RequestFactory, TestCase
+
+from kernel.admin.kernel import EstimatedCountPaginator, KernelUserAdmin
+from kernel.models import KernelUser
+
+from unittest import mock
+
+
+class AdminQueryTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.superuser = KernelUser.objects.create_superuser('admin@example.com', 'secret')
+        group = Group.objects.create(name='group')
+        for i in range(3):
+            KernelUser.objects.create_user('{}@example.com'.format(i)).groups.add(group)
+
+    def setUp(self):
+        self.model_admin = KernelUserAdmin(KernelUser, admin.AdminSite())
+        self.request = RequestFactory().get('/')
+        self.request.user = self.superuser
+
+    def test_prefetch_only_in_changelist(self):
+        self.assertEqual(self.model_admin.get_queryset(self.request)._prefetch_related_lookups, ())
+        response = self.model_admin.changelist_view(self.request)
+        changelist = response.context_data['cl']
+        self.assertIn('groups', changelist.queryset._prefetch_related_lookups)
+        with self.assertNumQueries(2):
+            self.assertEqual(sorted(self.model_admin.groups_list(obj) for obj in changelist.queryset),
+                             ['', 'group', 'group', 'group'])
+
+    def test_pages_past_the_estimate(self):
+        queryset = KernelUser.objects.order_by('pk')
+        with mock.patch('kernel.admin.kernel.count_queryset', return_value=1):
+            paginator = EstimatedCountPaginator(queryset, 2)
+            self.assertEqual(paginator.num_pages, 1)
+            self.assertEqual(len(paginator.page(2).object_list), 2)
+        self.assertEqual((paginator.count, paginator.num_pages), (4, 2))
@@ -0,0 +1,60 @@
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from kernel.backends import KernelAuthBackend
+from kernel.models import KernelUser
+
+from unittest import mock
+
+
+@override_settings(KERNEL_USER_CACHE=True)
+class UserCacheTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        on_commit = mock.patch('django.db.transaction.on_commit', side_effect=lambda func, using=None: func())
+        on_commit.start()
+        self.addCleanup(on_commit.stop)
+        self.backend = KernelAuthBackend()
+        self.user = KernelUser.objects.create_user('user@example.com', 'secret', first_name='First')
+        self.backend.get_user(self.user.pk)
+
+    def test_hit_without_queries(self):
+        with self.assertNumQueries(0):
+            user = self.backend.get_user(self.user.pk)
+            self.assertEqual(user.first_name, 'First')
+            self.assertEqual(user.get_session_auth_hash(), self.user.get_session_auth_hash())
+            self.assertEqual([group.pk for group in user.groups.all()], [])
+            self.assertFalse(user.has_perm('tests.change_document'))
+
+    def test_snapshot_has_no_password(self):
+        snapshot = KernelAuthBackend.to_snapshot(self.user)
+        self.assertNotIn('password', dict(snapshot['fields']))
+        self.assertNotIn('last_login', dict(snapshot['fields']))
+
+    def test_save_invalidates(self):
+        self.user.first_name = 'Second'
+        self.user.save()
+        self.assertEqual(self.backend.get_user(self.user.pk).first_name, 'Second')
+
+    def test_queryset_update_invalidates(self):
+        KernelUser.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+
+    def test_group_and_permission_changes_invalidate(self):
+        group = Group.objects.create(name='editors')
+        self.user.groups.add(group)
+        self.assertEqual([g.name for g in self.backend.get_user(self.user.pk).groups.all()], ['editors'])
+
+        group.permissions.add(Permission.objects.get(codename='change_document'))
+        self.assertTrue(self.backend.get_user(self.user.pk).has_perm('tests.change_document'))
+
+        self.user.user_permissions.add(Permission.objects.get(codename='delete_document'))
+        self.assertTrue(self.backend.get_user(self.user.pk).has_perm('tests.delete_document'))
+
+    @override_settings(KERNEL_USER_CACHE=False)
+    def test_database_fallback(self):
+        with self.assertNumQueries(4):
+            self.assertEqual(self.backend.get_user(self.user.pk).pk, self.user.pk)
+        self.assertIsNone(self.backend.get_user(0))
@@ -0,0 +1,47 @@
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.test import TestCase
+
+from kernel.models import KernelUser
+
+from importlib import import_module
+
+import datetime
+
+
+class BirthdaysTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = {}
+        for name, date_birth in (('feb28', datetime.date(1990, 2, 28)), ('leap', datetime.date(1992, 2, 29)),
+                                 ('mar1', datetime.date(1991, 3, 1)), ('dec31', datetime.date(1980, 12, 31)),
+                                 ('jan2', datetime.date(1985, 1, 2))):
+            cls.users[name] = KernelUser.objects.create_user('{}@example.com'.format(name), date_birth=date_birth)
+
+    def birthdays(self, today, days):
+        return [user.email.split('@')[0] for user in KernelUser.objects.birthdays(days, today)]
+
+    def test_range_with_wraparound(self):
+        self.assertEqual(self.birthdays(datetime.date(2026, 12, 30), 3), ['dec31', 'jan2'])
+        self.assertEqual(self.birthdays(datetime.date(2026, 3, 1), 0), ['mar1'])
+
+    def test_leap_day_in_non_leap_years(self):
+        self.assertEqual(self.birthdays(datetime.date(2027, 2, 28), 0), ['feb28', 'leap'])
+        self.assertEqual(self.birthdays(datetime.date(2026, 12, 1), 89), ['dec31', 'jan2', 'feb28', 'leap'])
+        self.assertEqual(self.birthdays(datetime.date(2027, 3, 1), 0), ['mar1'])
+
+    def test_leap_day_in_leap_years(self):
+        self.assertEqual(self.birthdays(datetime.date(2028, 2, 28), 0), ['feb28'])
+        self.assertEqual(self.birthdays(datetime.date(2028, 2, 29), 0), ['leap'])
+
+    def test_migration_recomputes_birth_int(self):
+        KernelUser.objects.filter(pk=self.users['mar1'].pk).update(birth_int=60)
+        KernelUser.objects.filter(pk=self.users['jan2'].pk).update(date_birth=None)
+        migration = import_module('kernel.migrations.0004_birth_int_backfill')
+        state = MigrationLoader(connection).project_state(('kernel', '0004_birth_int_backfill'))
+        with connection.schema_editor() as editor:
+            migration.recompute_birth_int(state.apps, editor)
+        values = dict(KernelUser.objects.values_list('email', 'birth_int'))
+        self.assertEqual(values['mar1@example.com'], 61)
+        self.assertIsNone(values['jan2@example.com'])
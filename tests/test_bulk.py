@@ -0,0 +1,133 @@
+from django.contrib.auth.models import Permission
+from django.test import TestCase
+
+from rest_framework import serializers
+from rest_framework.permissions import DjangoModelPermissions
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from kernel.db import bulk_update
+from kernel.models import KernelUser
+from kernel.rest.viewsets import KernelViewSets
+
+from tests.models import Article, Document
+
+
+class DocumentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Document
+        fields = ('id', 'title', 'body')
+
+
+class DocumentViewSet(KernelViewSets):
+    queryset = Document.objects.all()
+    serializer_class = DocumentSerializer
+
+
+class ArticleSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Article
+        fields = ('id', 'title', 'slug', 'introtext', 'content')
+
+
+class ArticleViewSet(KernelViewSets):
+    queryset = Article.objects.all()
+    serializer_class = ArticleSerializer
+
+
+class UserSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = KernelUser
+        fields = ('id', 'email', 'date_birth')
+
+
+class UserViewSet(KernelViewSets):
+    queryset = KernelUser.objects.all()
+    serializer_class = UserSerializer
+
+
+class PermissionViewSet(DocumentViewSet):
+    permission_classes = (DjangoModelPermissions, )
+
+
+class BulkTest(TestCase):
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+
+    def call(self, action, method, data, viewset=DocumentViewSet, user=None):
+        request = getattr(self.factory, method)('/', data, format='json')
+        if user is not None:
+            force_authenticate(request, user)
+        return viewset.as_view({method: action})(request)
+
+    def test_bulk_update_helper(self):
+        documents = [Document.objects.create(title=str(i)) for i in range(3)]
+        for document in documents:
+            document.title = 'new {}'.format(document.pk)
+            document.views = document.pk
+        self.assertEqual(bulk_update(Document.objects, documents, ['title', 'views'], batch_size=2), 3)
+        for document in Document.objects.all():
+            self.assertEqual((document.title, document.views), ('new {}'.format(document.pk), document.pk))
+
+    def test_upsert_keeps_external_id(self):
+        existing = Document.objects.create(title='old', external_id='a')
+        response = self.call('bulk_upsert', 'post', [
+            {'external_id': 'a', 'title': 'changed'},
+            {'external_id': 'b', 'title': 'new'},
+            {'external_id': 'b', 'title': 'again'},
+        ])
+        self.assertEqual([r['status'] for r in response.data], ['updated', 'created', 'error'])
+        self.assertEqual(Document.objects.get(pk=existing.pk).title, 'changed')
+        self.assertEqual(Document.objects.get(external_id='b').title, 'new')
+        self.assertEqual(Document.objects.count(), 2)
+
+        response = self.call('bulk_upsert', 'post', [{'external_id': 'b', 'title': 'updated'}])
+        self.assertEqual(response.data[0]['status'], 'updated')
+        self.assertEqual(Document.objects.get(external_id='b').title, 'updated')
+
+    def test_upsert_of_existing_rows_needs_change_permission(self):
+        Document.objects.create(title='old', external_id='a')
+        user = KernelUser.objects.create_user('user@example.com', 'secret')
+        user.user_permissions.add(Permission.objects.get(codename='add_document'))
+        user = KernelUser.objects.get(pk=user.pk)
+
+        response = self.call('bulk_upsert', 'post', [{'external_id': 'new', 'title': 'new'}], PermissionViewSet, user)
+        self.assertEqual(response.data[0]['status'], 'created')
+        response = self.call('bulk_upsert', 'post', [{'external_id': 'a', 'title': 'changed'}], PermissionViewSet, user)
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(Document.objects.get(external_id='a').title, 'old')
+
+    def test_object_permissions_per_row(self):
+        documents = [Document.objects.create(title=str(i)) for i in range(2)]
+
+        class OddViewSet(DocumentViewSet):
+            def check_object_permissions(self, request, obj):
+                raise AssertionError('rows are checked one by one')
+
+            def has_bulk_object_permission(self, request, obj, method=None):
+                return obj.pk == documents[0].pk
+
+        response = self.call('bulk_update', 'patch', [{'id': d.pk, 'title': 'x'} for d in documents], OddViewSet)
+        self.assertEqual([r['status'] for r in response.data], ['updated', 'error'])
+        response = self.call('bulk_delete', 'delete', [d.pk for d in documents], OddViewSet)
+        self.assertEqual([r['status'] for r in response.data], ['deleted', 'error'])
+        self.assertEqual(list(Document.objects.values_list('pk', flat=True)), [documents[1].pk])
+
+    def test_bulk_writes_fill_save_fields(self):
+        response = self.call('bulk_create', 'post', [
+            {'email': 'a@example.com', 'date_birth': '1990-03-01'},
+        ], UserViewSet)
+        self.assertEqual(response.data[0]['status'], 'created')
+        user = KernelUser.objects.get(email='a@example.com')
+        self.assertEqual(user.birth_int, 61)
+        self.assertIs(type(KernelUser.objects.get(pk=user.pk)), KernelUser)
+        self.assertEqual(user.polymorphic_ctype, user.get_content_type())
+
+        response = self.call('bulk_update', 'patch', [{'id': user.pk, 'date_birth': '1990-01-02'}], UserViewSet)
+        self.assertEqual(response.data[0]['status'], 'updated')
+        self.assertEqual(KernelUser.objects.get(pk=user.pk).birth_int, 2)
+
+        response = self.call('bulk_create', 'post', [{'title': 'Hello world', 'introtext': 'a', 'content': 'b'}],
+                             ArticleViewSet)
+        self.assertEqual(response.data[0]['status'], 'created')
+        self.assertEqual(Article.objects.get().slug, 'hello-world')
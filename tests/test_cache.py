@@ -0,0 +1,91 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from kernel import cache as kcache
+
+from tests.models import Article
+
+from unittest import mock
+
+
+def on_commit(func, using=None):
+    func()
+
+
+@mock.patch('django.db.transaction.on_commit', side_effect=on_commit)
+class CacheTagsTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def create(self, **kwargs):
+        kwargs.setdefault('introtext', 'intro')
+        kwargs.setdefault('content', 'content')
+        return Article.objects.create(**kwargs)
+
+    def counter(self):
+        calls = []
+
+        def builder():
+            calls.append(1)
+            return len(calls)
+        return builder, calls
+
+    def test_get_or_set_version_change(self, on_commit):
+        builder, calls = self.counter()
+        key = kcache.make_key('a', ['t1', 't2'])
+        self.assertEqual(kcache.get_or_set('a', ['t1', 't2'], builder), 1)
+        self.assertEqual(kcache.get_or_set('a', ['t1', 't2'], builder), 1)
+        kcache.bump_tags('t2')
+        self.assertNotEqual(kcache.make_key('a', ['t1', 't2']), key)
+        self.assertEqual(kcache.get_or_set('a', ['t1', 't2'], builder), 2)
+        self.assertEqual(kcache.get_or_set('a', ['t1'], builder), 3)
+        self.assertEqual(len(calls), 3)
+
+    def test_save_and_delete_bump_tags(self, on_commit):
+        article = self.create(title='First')
+        tags = article.cache_tags() + Article.list_cache_tags()
+        versions = kcache.get_versions(tags)
+        article.title = 'Changed'
+        article.save()
+        changed = kcache.get_versions(tags)
+        self.assertTrue(all(new > old for new, old in zip(changed, versions)))
+        article.delete()
+        self.assertTrue(all(new > old for new, old in zip(kcache.get_versions(tags), changed)))
+
+    def test_fragments_invalidated(self, on_commit):
+        article = self.create(title='First')
+        other = self.create(title='Other')
+        builder, calls = self.counter()
+        article.cache_fragment('body', builder)
+        other.cache_fragment('body', builder)
+        Article.cache_list_fragment('feed', builder)
+        self.assertEqual(len(calls), 3)
+        article.cache_fragment('body', builder)
+        other.cache_fragment('body', builder)
+        Article.cache_list_fragment('feed', builder)
+        self.assertEqual(len(calls), 3)
+
+        article.save()
+        article.cache_fragment('body', builder)
+        other.cache_fragment('body', builder)
+        Article.cache_list_fragment('feed', builder)
+        self.assertEqual(len(calls), 5)
+
+    def test_slug_tags(self, on_commit):
+        article = self.create(title='First')
+        self.assertEqual(article.slug, 'first')
+        builder, calls = self.counter()
+        Article.cache_detail_fragment('first', 'body', builder)
+        Article.cache_detail_fragment('first', 'body', builder)
+        self.assertEqual(len(calls), 1)
+
+        article = Article.objects.get(pk=article.pk)
+        article.slug = 'renamed'
+        article.save()
+        Article.cache_detail_fragment('first', 'body', builder)
+        self.assertEqual(len(calls), 2)
+        Article.cache_detail_fragment('renamed', 'body', builder)
+        Article.objects.get(pk=article.pk).delete()
+        Article.cache_detail_fragment('renamed', 'body', builder)
+        self.assertEqual(len(calls), 4)
@@ -0,0 +1,77 @@
+from django.db import connection
+from django.test import TestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth.models import AnonymousUser
+
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory
+
+from kernel import conditional
+from kernel.rest.viewsets import KernelViewSets
+
+from tests.models import Category, Document, Note
+
+from unittest import mock
+
+
+class NoteSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Note
+        fields = ('id', 'text')
+
+
+class NoteViewSet(KernelViewSets):
+    queryset = Note.objects.all()
+    serializer_class = NoteSerializer
+
+
+class ConditionalTest(TestCase):
+
+    def setUp(self):
+        self.request = RequestFactory().get('/documents/')
+        self.request.user = AnonymousUser()
+
+    def test_off_by_default(self):
+        self.assertFalse(Document.CONDITIONAL_GET)
+
+    def test_list_count_is_optional(self):
+        documents = [Document.objects.create(title=str(i)) for i in range(3)]
+        with CaptureQueriesContext(connection) as queries:
+            etag, last_modified = conditional.queryset_validators(Document.objects.all(), self.request, count=False)
+        self.assertIsNone(last_modified)
+        self.assertNotIn('COUNT', queries[0]['sql'].upper())
+
+        counted, _ = conditional.queryset_validators(Document.objects.all(), self.request)
+        Document.objects.filter(pk=documents[0].pk).delete()
+        self.assertNotEqual(counted, conditional.queryset_validators(Document.objects.all(), self.request)[0])
+
+    def test_keyset_list_sees_deletions(self):
+        notes = [Note.objects.create(text=str(i)) for i in range(2)]
+        etag, _ = conditional.queryset_validators(Note.objects.all(), self.request, count=False)
+        with mock.patch('django.db.transaction.on_commit', side_effect=lambda func, using=None: func()):
+            notes[0].delete()
+            self.assertNotEqual(etag, conditional.queryset_validators(Note.objects.all(), self.request, count=False)[0])
+            etag, _ = conditional.queryset_validators(Note.objects.all(), self.request, count=False)
+            Note.objects.filter(pk=notes[1].pk).delete()
+        self.assertNotEqual(etag, conditional.queryset_validators(Note.objects.all(), self.request, count=False)[0])
+
+    def test_etag_varies_by_format(self):
+        Note.objects.create(text='a')
+        factory = APIRequestFactory()
+        view = NoteViewSet.as_view({'get': 'list'})
+        json = view(factory.get('/notes/', HTTP_ACCEPT='application/json'))
+        html = view(factory.get('/notes/', HTTP_ACCEPT='text/html'))
+        self.assertNotEqual(json['ETag'], html['ETag'])
+        self.assertIn('Accept', json['Vary'])
+        cached = view(factory.get('/notes/', HTTP_ACCEPT='application/json', HTTP_IF_NONE_MATCH=json['ETag']))
+        self.assertEqual(cached.status_code, 304)
+        self.assertIn('Accept', cached['Vary'])
+
+    def test_object_extra_parts(self):
+        category = Category.objects.create(name='a')
+        document = Document.objects.create(title='a', category=category)
+        etag, last_modified = conditional.object_validators(document, self.request)
+        self.assertIsNotNone(last_modified)
+        extra, extra_modified = conditional.object_validators(document, self.request, category.modified_date)
+        self.assertNotEqual(etag, extra)
+        self.assertIsNone(extra_modified)
@@ -0,0 +1,50 @@
+from django.db import transaction
+from django.test import TestCase
+
+from kernel.counters import ViewCounter
+
+from tests.models import Document, Missing
+
+
+class ViewCounterTest(TestCase):
+
+    def setUp(self):
+        self.document = Document.objects.create(title='document')
+        self.counter = ViewCounter(threshold=2, interval=3600)
+
+    def views(self):
+        return Document.objects.get(pk=self.document.pk).views
+
+    def test_flush_writes_increments(self):
+        self.counter.incr(self.document, 3)
+        self.counter.flush()
+        self.assertEqual(self.views(), 3)
+        self.assertEqual(self.counter.pending(self.document), 0)
+
+    def test_threshold_waits_for_commit(self):
+        with transaction.atomic():
+            self.counter.incr(self.document)
+            self.counter.incr(self.document)
+            self.assertEqual(self.views(), 0)
+        self.assertEqual(self.counter.pending(self.document), 2)
+
+    def test_rolled_back_request_keeps_buffer(self):
+        try:
+            with transaction.atomic():
+                self.counter.incr(self.document, 2)
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertEqual(self.counter.pending(self.document), 2)
+        self.counter.flush()
+        self.assertEqual(self.views(), 2)
+
+    def test_failed_flush_keeps_transaction_and_buffer(self):
+        missing = Missing(pk=1)
+        with transaction.atomic():
+            self.counter.incr(missing, 5)
+            self.counter.incr(self.document, 1)
+            with self.assertLogs('kernel.counters', 'ERROR'):
+                self.counter.flush()
+            self.assertEqual(self.views(), 1)
+        self.assertEqual(self.counter.pending(missing), 5)
@@ -0,0 +1,48 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from kernel import export
+
+from tests.models import Document
+
+import csv
+import io
+
+
+class ExportTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(5):
+            Document.objects.create(title='title {}'.format(i), body='a, "b"\nc')
+
+    def resource(self):
+        return Document.get_export_class()()
+
+    def test_csv_is_streamed(self):
+        resource = self.resource()
+        response = export.streaming_export_response(resource, Document.objects.order_by('pk'), 'csv', 'documents',
+                                                    chunk_size=2)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="documents.csv"')
+
+        with CaptureQueriesContext(connection) as queries:
+            content = iter(response.streaming_content)
+            header = next(content)
+            self.assertEqual(len(queries), 0)
+            rest = list(content)
+        self.assertEqual(len(rest), 5)
+        rows = list(csv.reader(io.StringIO(b''.join([header] + rest).decode('utf-8'), newline='')))
+        self.assertEqual(rows[0], [str(h) for h in resource.get_export_headers()])
+        title = rows[0].index('title')
+        self.assertEqual([row[title] for row in rows[1:]], ['title {}'.format(i) for i in range(5)])
+        self.assertEqual({row[rows[0].index('body')] for row in rows[1:]}, {'a, "b"\nc'})
+
+    def test_xlsx_file(self):
+        from openpyxl import load_workbook
+        response = export.streaming_export_response(self.resource(), Document.objects.order_by('pk'), 'xlsx')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="export.xlsx"')
+        sheet = load_workbook(io.BytesIO(b''.join(response.streaming_content))).active
+        self.assertEqual(sheet.max_row, 6)
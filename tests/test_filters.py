@@ -0,0 +1,52 @@
+from django.test import TestCase
+
+from rest_framework.exceptions import ValidationError
+
+from kernel.filters import ListFilter
+
+from tests.models import Document
+
+from unittest import mock
+
+import base64
+import zlib
+
+
+def compress(value):
+    return 'z:' + base64.urlsafe_b64encode(zlib.compress(value.encode('utf-8'))).decode('ascii').rstrip('=')
+
+
+class ListFilterTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.documents = [Document.objects.create(title=str(i)) for i in range(3)]
+
+    def filter(self, value, **kwargs):
+        return sorted(ListFilter(name='id', **kwargs).filter(Document.objects.all(), value).values_list('pk', flat=True))
+
+    def test_plain_and_compressed(self):
+        pks = [d.pk for d in self.documents[:2]]
+        value = ','.join(str(pk) for pk in pks + pks + ['x', ''])
+        self.assertEqual(self.filter(value), pks)
+        self.assertEqual(self.filter(compress(value)), pks)
+
+    def test_over_threshold(self):
+        value = ','.join(str(pk) for pk in range(1, 2001))
+        self.assertEqual(self.filter(value, threshold=10), [d.pk for d in self.documents])
+
+    def test_chunked_by_parameter_limit(self):
+        value = ','.join(str(pk) for pk in range(1, 21))
+        with mock.patch.object(ListFilter, 'get_chunk_size', return_value=3):
+            qs = ListFilter(name='id', threshold=10).filter(Document.objects.all(), value)
+        self.assertEqual(str(qs.query).count(' IN ('), 7)
+        self.assertEqual(sorted(qs.values_list('pk', flat=True)), [d.pk for d in self.documents])
+
+    def test_decompression_is_bounded(self):
+        with self.assertRaises(ValidationError):
+            self.filter(compress('1,' * (1 << 20)))
+        with self.assertRaises(ValidationError):
+            self.filter(compress('1,2')[:-4])
+
+    def test_no_global_lookup(self):
+        self.assertIsNone(Document._meta.get_field('title').get_lookup('any'))
@@ -0,0 +1,117 @@
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from kernel import images
+from kernel.models import KernelUser
+
+from io import BytesIO, StringIO
+from PIL import Image
+from unittest import mock
+
+import datetime
+import shutil
+import tempfile
+
+
+class LazyVariationTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.media_root = tempfile.mkdtemp()
+        cls.settings_override = override_settings(MEDIA_ROOT=cls.media_root, MEDIA_URL='/media/')
+        cls.settings_override.enable()
+        super(LazyVariationTest, cls).setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super(LazyVariationTest, cls).tearDownClass()
+        cls.settings_override.disable()
+        shutil.rmtree(cls.media_root)
+
+    def setUp(self):
+        buffer = BytesIO()
+        Image.new('RGB', (800, 800)).save(buffer, 'JPEG')
+        self.name = default_storage.save('photos/user.jpg', ContentFile(buffer.getvalue()))
+        user = KernelUser.objects.create_user('user@example.com', 'secret')
+        KernelUser.objects.filter(pk=user.pk).update(photo=self.name)
+        self.user_pk = user.pk
+
+    def variation(self, name):
+        return KernelUser._meta.get_field('photo').attr_class.get_variation_name(self.name, name)
+
+    def tearDown(self):
+        images.mark_rendered(self.name)
+
+    def get_user(self, age):
+        KernelUser.objects.filter(pk=self.user_pk).update(modified_date=timezone.now() - age)
+        return KernelUser.objects.get(pk=self.user_pk)
+
+    def test_old_image_urls_do_not_touch_storage(self):
+        user = self.get_user(datetime.timedelta(days=1))
+        images.mark_pending(self.name)
+        with mock.patch.object(default_storage, 'exists', side_effect=AssertionError('storage was asked')):
+            urls = [getattr(user.photo, name).url for name in ('large', 'medium', 'thumbnail', 'promotion')]
+        self.assertEqual(urls[2], '/media/' + self.variation('thumbnail'))
+
+    def test_deferred_image_field(self):
+        user = KernelUser.objects.defer('photo').get(pk=self.user_pk)
+        self.assertEqual(user.photo.thumbnail.name, self.variation('thumbnail'))
+
+    def test_rendered_image_urls_do_not_touch_storage(self):
+        user = self.get_user(datetime.timedelta(seconds=1))
+        with mock.patch.object(default_storage, 'exists', side_effect=AssertionError('storage was asked')):
+            self.assertEqual(user.photo.thumbnail.url, '/media/' + self.variation('thumbnail'))
+
+    def test_pending_variation_is_rendered_on_access(self):
+        images.mark_pending(self.name)
+        user = self.get_user(datetime.timedelta(seconds=1))
+        self.assertEqual(user.photo.thumbnail.url, '/media/' + self.variation('thumbnail'))
+        self.assertTrue(default_storage.exists(self.variation('thumbnail')))
+
+    @override_settings(KERNEL_IMAGE_RENDER_ON_ACCESS=False, KERNEL_IMAGE_PLACEHOLDER='/static/placeholder.png')
+    def test_pending_variation_placeholder(self):
+        images.mark_pending(self.name)
+        user = self.get_user(datetime.timedelta(seconds=1))
+        self.assertEqual(user.photo.thumbnail.url, '/static/placeholder.png')
+
+    def test_missing_variation_is_rendered_lazily(self):
+        images.mark_pending(self.name)
+        user = self.get_user(datetime.timedelta(seconds=1))
+        self.assertFalse(default_storage.exists(self.variation('medium')))
+        self.assertEqual(user.photo.medium.url, '/media/' + self.variation('medium'))
+        self.assertTrue(default_storage.exists(self.variation('medium')))
+        self.assertFalse(default_storage.exists(self.variation('large')))
+
+    def test_rendering_waits_for_commit(self):
+        variations = KernelUser._meta.get_field('photo').variations
+        callbacks = []
+        with mock.patch.object(images.transaction, 'on_commit', side_effect=callbacks.append), \
+                mock.patch.object(images, 'submit_variation') as submit:
+            self.assertFalse(images.render_variations_later(self.name, variations, default_storage))
+            self.assertTrue(images.is_pending(self.name))
+            self.assertFalse(submit.called)
+            callbacks.pop()()
+        self.assertEqual(submit.call_count, len(variations))
+
+    def test_render_variations_command(self):
+        out = StringIO()
+        call_command('kernel_render_variations', 'kernel.KernelUser.photo', workers=1, stdout=out)
+        self.assertIn('Rendered: 4, failed: 0', out.getvalue())
+        self.assertTrue(default_storage.exists(self.variation('thumbnail')))
+
+    @override_settings(KERNEL_IMAGE_EXECUTOR='sync')
+    def test_sync_executor_renders_in_request(self):
+        self.assertTrue(images.render_variations_later(self.name, {'a': {}}, default_storage))
+        self.assertFalse(images.is_pending(self.name))
+
+    def test_background_rendering_clears_pending(self):
+        variations = KernelUser._meta.get_field('photo').variations
+        with mock.patch.object(images.transaction, 'on_commit', side_effect=lambda func: func()):
+            self.assertFalse(images.render_variations_later(self.name, variations, default_storage))
+        images.get_executor().shutdown(wait=True)
+        images._executor = None
+        self.assertFalse(images.is_pending(self.name))
+        self.assertTrue(default_storage.exists(self.variation('medium')))
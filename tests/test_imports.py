@@ -0,0 +1,57 @@
+from django.test import TestCase, override_settings
+
+from tests.models import Document
+
+import csv
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+
+class BulkImportTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def write_csv(self, rows):
+        path = os.path.join(self.directory, 'documents.csv')
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['external_id', 'title'])
+            writer.writerows(rows)
+        return path
+
+    def test_create_and_update_by_external_id(self):
+        Document.objects.create(title='old', external_id='a')
+        path = self.write_csv([('a', 'changed'), ('b', 'new'), ('c', 'x' * 200)])
+        checkpoint = os.path.join(self.directory, 'checkpoint.json')
+        errors = os.path.join(self.directory, 'errors.csv')
+
+        state = Document.bulk_import(path, workers=0, chunk_size=2, checkpoint=checkpoint, errors=errors)
+        self.assertEqual((state['rows'], state['created'], state['updated'], state['errors']), (3, 1, 1, 1))
+        self.assertEqual(dict(Document.objects.values_list('external_id', 'title')), {'a': 'changed', 'b': 'new'})
+        with open(errors, encoding='utf-8') as f:
+            self.assertEqual([row[:2] for row in csv.reader(f)][1:], [['4', 'title']])
+        with open(checkpoint, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)['rows'], 3)
+
+        state = Document.bulk_import(path, workers=0, chunk_size=2, checkpoint=checkpoint)
+        self.assertEqual(state['rows'], 3)
+        self.assertEqual(Document.objects.count(), 2)
+
+    def test_process_pool(self):
+        path = self.write_csv([(str(i), 'title {}'.format(i)) for i in range(10)])
+        state = Document.bulk_import(path, workers=2, chunk_size=3)
+        self.assertEqual((state['rows'], state['created'], state['errors']), (10, 10, 0))
+        self.assertEqual(Document.objects.get(external_id='7').title, 'title 7')
+
+    @unittest.skipIf(sys.version_info < (3, 7), 'pool initializer needs Python 3.7')
+    @override_settings(KERNEL_WORKER_START_METHOD='spawn')
+    def test_spawned_workers_set_up_django(self):
+        path = self.write_csv([(str(i), 'title {}'.format(i)) for i in range(4)])
+        state = Document.bulk_import(path, workers=2, chunk_size=2)
+        self.assertEqual((state['created'], state['errors']), (4, 0))
@@ -0,0 +1,48 @@
+from django.apps import apps
+from django.db import connection, IntegrityError, transaction
+from django.db.migrations.state import ProjectState
+from django.test import TransactionTestCase
+
+from kernel.indexes import CreateIndex, published_index, unique_external_id
+
+from tests.models import Document
+
+
+class CreateIndexTest(TransactionTestCase):
+
+    def run_operation(self, operation, backwards=False):
+        state = ProjectState.from_apps(apps)
+        with connection.schema_editor() as editor:
+            if backwards:
+                operation.database_backwards('tests', editor, state, state)
+            else:
+                operation.database_forwards('tests', editor, state, state)
+
+    def constraints(self):
+        with connection.cursor() as cursor:
+            return connection.introspection.get_constraints(cursor, Document._meta.db_table)
+
+    def test_partial_index(self):
+        operation = CreateIndex('document', 'document_views_idx', ['-created_date'], condition={'views': 1})
+        with connection.schema_editor() as editor:
+            self.assertIn('WHERE "views" = 1', operation.create_sql(Document, editor))
+        self.run_operation(operation)
+        self.assertIn('document_views_idx', self.constraints())
+        self.run_operation(operation, backwards=True)
+        self.assertNotIn('document_views_idx', self.constraints())
+
+    def test_unique_external_id(self):
+        operation = unique_external_id('document')
+        self.run_operation(operation)
+        try:
+            Document.objects.create(title='a', external_id='same')
+            with self.assertRaises(IntegrityError), transaction.atomic():
+                Document.objects.create(title='b', external_id='same')
+        finally:
+            self.run_operation(operation, backwards=True)
+
+    def test_published_index_deconstructs(self):
+        name, args, kwargs = published_index('Article', partial=True).deconstruct()
+        self.assertEqual(name, 'CreateIndex')
+        self.assertEqual(kwargs, {'model_name': 'article', 'name': 'article_pub_idx',
+                                  'fields': ['-created_date'], 'condition': {'status': 1}})
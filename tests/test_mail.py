@@ -0,0 +1,91 @@
+from django.core import mail
+from django.core.mail import get_connection
+from django.test import SimpleTestCase
+
+from kernel.mail import send_bulk_mail
+
+from types import SimpleNamespace
+from unittest import mock
+
+import smtplib
+
+
+def disconnected():
+    return smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+
+
+def busy():
+    return smtplib.SMTPDataError(451, 'Try again later')
+
+
+def refused():
+    return smtplib.SMTPRecipientsRefused({'user1@example.com': (550, 'No such user')})
+
+
+def rejected():
+    return smtplib.SMTPDataError(554, 'Message rejected')
+
+
+class StubSMTP(object):
+    """ smtplib.SMTP replacement: records recipients, raises the error listed for a sendmail call number """
+    fail_on = {}
+    calls = 0
+    sent = []
+    connections = 0
+
+    def __init__(self, *args, **kwargs):
+        StubSMTP.connections += 1
+
+    def sendmail(self, from_addr, to_addrs, msg):
+        StubSMTP.calls += 1
+        if StubSMTP.calls in self.fail_on:
+            raise self.fail_on[StubSMTP.calls]()
+        StubSMTP.sent.append(tuple(to_addrs))
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def users(count):
+    return [SimpleNamespace(email='user{}@example.com'.format(i)) for i in range(count)]
+
+
+class SendBulkMailTest(SimpleTestCase):
+
+    def test_locmem(self):
+        progress = []
+        sent, failed = send_bulk_mail('notice', users(5), {'text': 'news'}, batch_size=2, workers=2,
+                                      progress=lambda *state: progress.append(state))
+        self.assertEqual((sent, failed), (5, 0))
+        self.assertEqual(progress, [(2, 0), (4, 0), (5, 0)])
+        self.assertEqual([m.to for m in mail.outbox], [[user.email] for user in users(5)])
+        self.assertEqual(mail.outbox[0].subject, 'Notice for user0@example.com')
+        self.assertIn('news', mail.outbox[0].body)
+
+    def send_smtp(self, fail_on, retries):
+        StubSMTP.fail_on, StubSMTP.calls, StubSMTP.sent, StubSMTP.connections = fail_on, 0, [], 0
+        connection = get_connection('django.core.mail.backends.smtp.EmailBackend')
+        with mock.patch('django.core.mail.backends.smtp.smtplib.SMTP', StubSMTP):
+            return send_bulk_mail('notice', users(4), batch_size=4, retries=retries, retry_delay=0,
+                                  connection=connection)
+
+    def test_smtp_retry_sends_only_unsent_messages(self):
+        self.assertEqual(self.send_smtp({2: disconnected}, retries=1), (4, 0))
+        self.assertEqual(StubSMTP.sent, [(user.email, ) for user in users(4)])
+
+    def test_smtp_gives_up_on_one_message(self):
+        self.assertEqual(self.send_smtp({2: disconnected, 3: disconnected}, retries=1), (3, 1))
+        self.assertEqual(StubSMTP.sent, [(user.email, ) for i, user in enumerate(users(4)) if i != 1])
+
+    def test_smtp_retries_4xx_replies(self):
+        self.assertEqual(self.send_smtp({1: busy}, retries=1), (4, 0))
+        self.assertEqual(StubSMTP.calls, 5)
+
+    def test_smtp_permanent_failures_are_not_retried(self):
+        self.assertEqual(self.send_smtp({2: refused, 3: rejected}, retries=3), (2, 2))
+        self.assertEqual(StubSMTP.calls, 4)
+        self.assertEqual(StubSMTP.connections, 1)
+        self.assertEqual(StubSMTP.sent, [(users(4)[0].email, ), (users(4)[3].email, )])
@@ -0,0 +1,109 @@
+from django.contrib.auth.models import AnonymousUser
+from django.test import SimpleTestCase, RequestFactory
+
+from kernel import middleware
+from kernel.middleware import CrequestMiddleware, ThreadLocalVar
+
+import gc
+import threading
+import tracemalloc
+
+
+class CrequestMiddlewareTest(SimpleTestCase):
+
+    def setUp(self):
+        self.request = RequestFactory().get('/')
+        self.request.user = AnonymousUser()
+
+    def test_context_is_set_during_request_only(self):
+        seen = []
+
+        def get_response(request):
+            seen.append((CrequestMiddleware.get_request(), CrequestMiddleware.get_user()))
+            return 'response'
+
+        self.assertEqual(CrequestMiddleware(get_response)(self.request), 'response')
+        self.assertEqual(seen, [(self.request, self.request.user)])
+        self.assertIsNone(CrequestMiddleware.get_context())
+        self.assertEqual(CrequestMiddleware.get_user('default'), 'default')
+
+    def test_context_is_reset_after_exception(self):
+        def get_response(request):
+            raise ValueError
+
+        with self.assertRaises(ValueError):
+            CrequestMiddleware(get_response)(self.request)
+        self.assertIsNone(CrequestMiddleware.get_context())
+
+    def test_old_style_hooks(self):
+        instance = CrequestMiddleware()
+        instance.process_request(self.request)
+        self.assertIs(CrequestMiddleware.get_request(), self.request)
+        instance.process_response(self.request, None)
+        self.assertIsNone(CrequestMiddleware.get_context())
+
+    def test_set_user_outside_request(self):
+        user = AnonymousUser()
+        CrequestMiddleware.set_user(user)
+        self.assertIs(CrequestMiddleware.get_user(), user)
+        CrequestMiddleware.del_user()
+        self.assertIsNone(CrequestMiddleware.get_user())
+
+    def test_threads_are_isolated(self):
+        seen = {}
+
+        def run(index):
+            user = AnonymousUser()
+            CrequestMiddleware.set_user(user)
+            seen[index] = CrequestMiddleware.get_user() is user
+            CrequestMiddleware.del_user()
+
+        threads = [threading.Thread(target=run, args=(i, )) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(seen, {i: True for i in range(8)})
+        self.assertIsNone(CrequestMiddleware.get_context())
+
+    def test_no_growth_after_a_million_requests(self):
+        instance = CrequestMiddleware(lambda request: CrequestMiddleware.get_user())
+        for i in range(1000):
+            instance(self.request)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            for i in range(10 ** 6):
+                instance(self.request)
+            gc.collect()
+            growth = tracemalloc.get_traced_memory()[0] - before
+        finally:
+            tracemalloc.stop()
+        self.assertLess(growth, 64 * 1024)
+        self.assertIsNone(CrequestMiddleware.get_context())
+        self.assertFalse(hasattr(self.request, '_kernel_context_token'))
+
+
+class ThreadLocalVarTest(SimpleTestCase):
+
+    def test_get_set_reset(self):
+        var = ThreadLocalVar('test', default=None)
+        token = var.set(None)
+        var.reset(token)
+        self.assertIsNone(var.get())
+        token = var.set(1)
+        inner = var.set(2)
+        self.assertEqual(var.get(), 2)
+        var.reset(inner)
+        self.assertEqual(var.get(), 1)
+        var.reset(token)
+        self.assertIsNone(var.get())
+
+    def test_module_uses_context_var_when_available(self):
+        try:
+            import contextvars
+        except ImportError:
+            self.assertIsInstance(middleware._request_context, ThreadLocalVar)
+        else:
+            self.assertIsInstance(middleware._request_context, contextvars.ContextVar)
@@ -0,0 +1,42 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from kernel.pagination import KeysetPaginator, encode_cursor, decode_cursor
+
+from tests.models import Document
+
+import datetime
+
+
+class KeysetPaginatorTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        moment = timezone.now().replace(microsecond=500000)
+        for i in range(6):
+            document = Document.objects.create(title=str(i))
+            # rows inside one millisecond, only microseconds differ
+            Document.objects.filter(pk=document.pk).update(created_date=moment + datetime.timedelta(microseconds=i * 100))
+
+    def walk(self, ordering):
+        paginator = KeysetPaginator(Document.objects.all(), ordering, per_page=2)
+        titles, cursor = [], None
+        for i in range(10):
+            page = paginator.page(cursor)
+            titles.extend(document.title for document in page)
+            if not page.has_next():
+                break
+            cursor = page.next_cursor
+        return titles
+
+    def test_cursor_keeps_microseconds(self):
+        value = datetime.datetime(2020, 1, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+        values, reverse = decode_cursor(encode_cursor([value, 1]))
+        self.assertEqual(values[0], value.isoformat())
+        self.assertFalse(reverse)
+
+    def test_ascending_pages_do_not_repeat(self):
+        self.assertEqual(self.walk(('created_date', 'id')), ['0', '1', '2', '3', '4', '5'])
+
+    def test_descending_pages_do_not_skip(self):
+        self.assertEqual(self.walk(('-created_date', '-id')), ['5', '4', '3', '2', '1', '0'])
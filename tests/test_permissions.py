@@ -0,0 +1,49 @@
+from django.contrib.auth.models import AnonymousUser, Permission
+from django.test import TestCase, override_settings
+
+from kernel import permissions as kperm
+from kernel.models import KernelUser
+
+from tests.models import Document
+
+
+class PermissionsTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = KernelUser.objects.create_user('user@example.com', 'secret')
+        cls.documents = [Document.objects.create(title=str(i)) for i in range(4)]
+
+    def get_user(self):
+        return KernelUser.objects.get(pk=self.user.pk)
+
+    def test_model_permission_set_lookup(self):
+        self.assertFalse(kperm.has_perm(self.get_user(), 'tests.change_document'))
+        self.user.user_permissions.add(Permission.objects.get(codename='change_document'))
+        user = self.get_user()
+        self.assertTrue(kperm.has_perm(user, 'tests.change_document'))
+        self.assertTrue(Document.has_action_perm(user, 'change'))
+
+    @override_settings(AUTHENTICATION_BACKENDS=['tests.backends.HasPermOnlyBackend'])
+    def test_has_perm_only_backend(self):
+        self.assertFalse(kperm.backends_list_permissions())
+        self.assertTrue(kperm.has_perm(self.get_user(), 'tests.change_document'))
+        self.assertTrue(kperm.has_perm(AnonymousUser(), 'tests.change_document'))
+        self.assertFalse(kperm.has_perm(AnonymousUser(), 'tests.delete_document'))
+
+    @override_settings(AUTHENTICATION_BACKENDS=['tests.backends.HasPermOnlyBackend'])
+    def test_inactive_user_asks_backends(self):
+        user = self.get_user()
+        user.is_active = False
+        self.assertTrue(kperm.has_perm(user, 'tests.change_document'))
+
+    @override_settings(AUTHENTICATION_BACKENDS=['django.contrib.auth.backends.ModelBackend',
+                                                'tests.backends.EvenObjectBackend'])
+    def test_bulk_checks_object_permissions(self):
+        result = Document.can_objects_action(self.get_user(), 'change', self.documents)
+        self.assertEqual(result, {document.pk: document.pk % 2 == 0 for document in self.documents})
+
+    def test_bulk_model_permission_covers_every_object(self):
+        self.user.user_permissions.add(Permission.objects.get(codename='change_document'))
+        result = Document.can_objects_action(self.get_user(), 'change', self.documents)
+        self.assertEqual(set(result.values()), {True})
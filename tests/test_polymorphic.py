@@ -0,0 +1,45 @@
+from django.test import TestCase
+
+from kernel.models import KernelUser
+
+from tests.models import Document
+
+
+class DocumentSerializerData(Document):
+    """ Factory serializer with a relation to users """
+
+    class Meta:
+        proxy = True
+
+    @classmethod
+    def serializer_data(cls):
+        return ['id', 'title', 'created_by']
+
+
+class NonPolymorphicTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [KernelUser.objects.create_user('{}@example.com'.format(i)) for i in range(3)]
+        for user in cls.users:
+            Document.objects.create(title=user.email, created_by=user, modified_by=user)
+
+    def test_plain_objects(self):
+        self.assertTrue(KernelUser.plain_objects.all().polymorphic_disabled)
+        self.assertFalse(KernelUser.objects.all().polymorphic_disabled)
+        with self.assertNumQueries(1):
+            users = list(KernelUser.plain_objects.order_by('pk'))
+        self.assertEqual(users, self.users)
+
+    def test_lazy_queryset(self):
+        with self.assertNumQueries(1):
+            documents = list(Document.lazy_queryset().order_by('pk'))
+            self.assertEqual([d.created_by.email for d in documents], [u.email for u in self.users])
+            self.assertEqual([d.modified_by for d in documents], self.users)
+
+    def test_serializer_factory(self):
+        plain = DocumentSerializerData.serializer_class()
+        base = DocumentSerializerData.serializer_class(non_polymorphic=True)
+        self.assertIs(base, DocumentSerializerData.serializer_class(non_polymorphic=True))
+        self.assertFalse(plain().fields['created_by'].queryset.all().polymorphic_disabled)
+        self.assertTrue(base().fields['created_by'].queryset.polymorphic_disabled)
@@ -0,0 +1,40 @@
+from django.test import SimpleTestCase, override_settings
+
+from kernel.registry import registry
+
+from tests.models import Category, Document
+
+
+class RegistryTest(SimpleTestCase):
+
+    def setUp(self):
+        registry.clear()
+
+    def test_same_class_on_repeat_calls(self):
+        serializer_class = Document.serializer_class()
+        self.assertIs(Document.serializer_class(), serializer_class)
+        self.assertIsNot(Category.serializer_class(), serializer_class)
+        self.assertIs(Document.filter_class(), Document.filter_class())
+        self.assertEqual(registry.stats(), {'hits': 2, 'misses': 3, 'size': 3})
+
+    def test_invalidate(self):
+        serializer_class = Document.serializer_class()
+        category_class = Category.serializer_class()
+        filter_class = Document.filter_class()
+        registry.invalidate(Document, 'serializer_class')
+        self.assertIsNot(Document.serializer_class(), serializer_class)
+        self.assertIs(Document.filter_class(), filter_class)
+        registry.invalidate(Document)
+        self.assertIsNot(Document.filter_class(), filter_class)
+        self.assertIs(Category.serializer_class(), category_class)
+
+    def test_reset(self):
+        serializer_class = Document.serializer_class()
+        registry.clear()
+        self.assertEqual(registry.stats(), {'hits': 0, 'misses': 0, 'size': 0})
+        self.assertIsNot(Document.serializer_class(), serializer_class)
+
+        with override_settings(KERNEL_CLASS_REGISTRY=False):
+            self.assertEqual(registry.stats()['size'], 0)
+            self.assertIsNot(Document.serializer_class(), Document.serializer_class())
+            self.assertEqual(registry.stats()['size'], 0)
@@ -0,0 +1,68 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.test import APIRequestFactory
+
+from kernel.rest import renderers
+from kernel.rest.viewsets import KernelViewSets
+
+from tests.models import Document
+
+import datetime
+import decimal
+import unittest
+import uuid
+
+
+class RenderersTest(SimpleTestCase):
+
+    def test_opt_in(self):
+        self.assertEqual(list(KernelViewSets().renderer_classes), list(api_settings.DEFAULT_RENDERER_CLASSES))
+
+        class FastViewSet(KernelViewSets):
+            fast_renderers = True
+        self.assertIn(renderers.FastJSONRenderer, FastViewSet().renderer_classes)
+
+    @unittest.skipIf(renderers.orjson is None, 'orjson is not installed')
+    def test_same_output_as_json_renderer(self):
+        data = {
+            'created': datetime.datetime(2020, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc),
+            'day': datetime.date(2020, 1, 2), 'time': datetime.time(3, 4, 5, 678901),
+            'price': decimal.Decimal('1.50'), 'uuid': uuid.UUID(int=1),
+            'text': 'Привет \u2028\u2029 "quoted"', 'items': [1, 2.5, None, True],
+        }
+        self.assertEqual(renderers.FastJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(renderers.FastJSONRenderer().render(data, 'application/json; indent=4'),
+                         JSONRenderer().render(data, 'application/json; indent=4'))
+
+
+class DocumentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Document
+        fields = ('id', 'title', 'views', 'price', 'created_date')
+
+
+class DocumentViewSet(KernelViewSets):
+    queryset = Document.objects.all()
+    serializer_class = DocumentSerializer
+
+
+class FastDocumentViewSet(DocumentViewSet):
+    fast_values = True
+
+
+class FastValuesTest(TestCase):
+
+    def get(self, viewset):
+        return viewset.as_view({'get': 'list'})(APIRequestFactory().get('/')).data['results']
+
+    def test_same_data_as_serializer(self):
+        Document.objects.create(title='a', price=decimal.Decimal('1.50'))
+        Document.objects.create(title='b')
+        self.assertEqual(self.get(FastDocumentViewSet), self.get(DocumentViewSet))
+        self.assertEqual(self.get(FastDocumentViewSet)[0]['price'], '1.50')
+        with override_settings(REST_FRAMEWORK={'DATETIME_FORMAT': '%Y', 'COERCE_DECIMAL_TO_STRING': False}):
+            self.assertEqual(self.get(FastDocumentViewSet), self.get(DocumentViewSet))
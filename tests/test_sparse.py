@@ -0,0 +1,59 @@
+from django.test import TestCase
+
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory
+
+from kernel.registry import registry
+from kernel.rest.viewsets import KernelViewSets
+
+from tests.models import Document
+
+
+class DocumentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Document
+        fields = ('id', 'title', 'body')
+
+
+class DocumentViewSet(KernelViewSets):
+    queryset = Document.objects.all()
+    serializer_class = DocumentSerializer
+
+
+class ExpensiveSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Document
+        fields = ('id', 'title', 'body')
+        expensive_fields = ('body', )
+
+
+class ExpensiveViewSet(KernelViewSets):
+    queryset = Document.objects.all()
+    serializer_class = ExpensiveSerializer
+
+
+class SparseFieldsTest(TestCase):
+
+    def get(self, query, viewset=DocumentViewSet):
+        request = APIRequestFactory().get('/', query)
+        return viewset.as_view({'get': 'list'})(request)
+
+    def test_unknown_names_are_not_cached(self):
+        Document.objects.create(title='a', body='b')
+        response = self.get({'fields': 'title,unknown'})
+        self.assertEqual(list(response.data['results'][0]), ['title'])
+        size = registry.stats()['size']
+        for i in range(50):
+            self.get({'fields': 'title,f{}'.format(i), 'exclude': 'x{}'.format(i)})
+        self.assertEqual(registry.stats()['size'], size)
+
+    def test_expensive_fields_skipped_by_default(self):
+        Document.objects.create(title='a', body='b')
+        self.assertEqual(list(self.get({}, ExpensiveViewSet).data['results'][0]), ['id', 'title'])
+        self.assertEqual(list(self.get({'fields': 'title,body'}, ExpensiveViewSet).data['results'][0]),
+                         ['title', 'body'])
+        self.assertEqual(list(self.get({}).data['results'][0]), ['id', 'title', 'body'])
+
+        class FullViewSet(ExpensiveViewSet):
+            skip_expensive_fields = False
+        self.assertEqual(list(self.get({}, FullViewSet).data['results'][0]), ['id', 'title', 'body'])
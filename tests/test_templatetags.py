@@ -0,0 +1,45 @@
+from django.conf.urls import include, url
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from kernel.templatetags import kernel_tags
+
+
+def view(request):
+    return HttpResponse()
+
+
+class FirstUrls(object):
+    urlpatterns = [
+        url(r'^login/$', view, name='login'),
+        url(r'^admin/', include(([url(r'^login/$', view, name='login')], 'admin'), namespace='admin')),
+    ]
+
+
+class SecondUrls(object):
+    urlpatterns = [
+        url(r'^signin/$', view, name='login'),
+    ]
+
+
+class KernelTagsTest(SimpleTestCase):
+
+    def context(self, path):
+        return {'request': RequestFactory().get(path)}
+
+    @override_settings(ROOT_URLCONF=FirstUrls)
+    def test_active_after_urlconf_change(self):
+        self.assertEqual(kernel_tags.active(self.context('/login/'), 'login'), 'active')
+        with override_settings(ROOT_URLCONF=SecondUrls):
+            self.assertEqual(kernel_tags.active(self.context('/login/'), 'login'), '')
+            self.assertEqual(kernel_tags.active(self.context('/signin/'), 'login'), 'active')
+
+    @override_settings(ROOT_URLCONF=FirstUrls)
+    def test_active_view_namespaces(self):
+        admin = self.context('/admin/login/')
+        self.assertEqual(kernel_tags.active_view(admin, 'admin:login'), 'active')
+        self.assertEqual(kernel_tags.active_view(admin, 'admin:'), 'active')
+        self.assertEqual(kernel_tags.active_view(admin, 'login'), '')
+        plain = self.context('/login/')
+        self.assertEqual(kernel_tags.active_view(plain, 'login'), 'active')
+        self.assertEqual(kernel_tags.active_view(plain, 'admin:login', 'admin:'), '')
@@ -0,0 +1,39 @@
+import datetime
+
+from django.test import TestCase
+
+from kernel.models import KernelUser
+
+from tests.models import Document
+
+
+class UpsertTest(TestCase):
+
+    def test_upsert_by_external_id(self):
+        existing = Document.objects.create(title='old', external_id='a')
+        created, updated = Document.upsert_by_external_id([
+            {'external_id': 'a', 'title': 'changed'},
+            {'external_id': 'b', 'title': 'new'},
+            {'external_id': 'b', 'title': 'last'},
+            {'external_id': 'a', 'body': 'body'},
+            {'title': 'no id'},
+        ], batch_size=10)
+        self.assertEqual(len(created), 2)
+        self.assertEqual(updated, [existing])
+        existing.refresh_from_db()
+        self.assertEqual((existing.title, existing.body), ('changed', 'body'))
+        self.assertEqual(list(Document.objects.filter(external_id='b').values_list('title', flat=True)), ['last'])
+        self.assertEqual(Document.objects.count(), 3)
+
+    def test_repeated_external_id_across_batches(self):
+        Document.upsert_by_external_id([{'external_id': 'a', 'title': str(i)} for i in range(5)], batch_size=2)
+        self.assertEqual(list(Document.objects.values_list('title', flat=True)), ['4'])
+
+    def test_upsert_fills_save_fields(self):
+        KernelUser.upsert_by_external_id([
+            {'external_id': 'a', 'email': 'a@example.com', 'date_birth': datetime.date(1990, 3, 1)},
+        ])
+        user = KernelUser.objects.get(external_id='a')
+        self.assertEqual((user.birth_int, user.polymorphic_ctype), (61, user.get_content_type()))
+        KernelUser.upsert_by_external_id([{'external_id': 'a', 'date_birth': datetime.date(1990, 1, 2)}])
+        self.assertEqual(KernelUser.objects.get(pk=user.pk).birth_int, 2)
@@ -0,0 +1,32 @@
+from django.conf.urls import url
+from django.http import HttpResponse
+from django.test import SimpleTestCase
+
+from kernel.registry import registry
+
+from tests.models import Document
+
+from unittest import mock
+
+
+def feed(request):
+    return HttpResponse('feed')
+
+
+class RoutesTest(SimpleTestCase):
+
+    def tearDown(self):
+        registry.invalidate(Document)
+
+    def test_kernel_routes(self):
+        self.assertEqual(Document.route_kinds(), Document.ROUTES)
+        with mock.patch.object(Document, 'ROUTES', ('list', )):
+            self.assertEqual(Document.route_kinds(), ('list', ))
+
+    def test_custom_routes_are_kept(self):
+        get_uri_feed = classmethod(lambda cls: url(r'^document/feed/$', feed, name='document_feed'))
+        with mock.patch.object(Document, 'get_uri_feed', get_uri_feed, create=True), \
+                mock.patch.object(Document, 'ROUTES', ('list', )):
+            self.assertEqual(Document.route_kinds(), ('list', 'feed'))
+            self.assertEqual([pattern.name for pattern in Document.urls()], ['document_list', 'document_feed'])
+            self.assertIs(Document.get_route_view('feed'), feed)